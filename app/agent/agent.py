@@ -10,79 +10,99 @@ knowledge graph following a strict 4-step workflow:
   4. **Answer** — synthesise a cited answer or explain what's missing
 """
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Any
+import reprlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
 
-from app.core.openrouter import client
+import orjson
+
+from app.core.cache import TTLCache
+from app.core.openrouter import make_async_client
 from app.core.config import settings
 from app.core.prompts import (
     query_agent_system_prompt as AGENT_SYSTEM_PROMPT,
     answer_generation_prompt as ANSWER_PROMPT,
+    stalled_retrieval_nudge as STALLED_RETRIEVAL_NUDGE,
+)
+from app.domain.ontology import (
+    ENTITY_TYPES, ENTITY_TYPES_JSON, RELATIONSHIP_TYPES, RELATIONSHIP_TYPES_JSON,
 )
-from app.domain.ontology import ENTITY_TYPES, RELATIONSHIP_TYPES
 from app.graphrag.graph_retrieval import GraphRetriever
 
 logger = logging.getLogger(__name__)
 
 MAX_TOOL_ROUNDS = 12
+MAX_PARALLEL_FETCHES = 4      # concurrent retrieval tool calls per turn
+MAX_CONCURRENT_QUERIES = 4    # agent loops in flight in query_batch
+MAX_PREFETCH_ENTITIES = 5     # speculative search_nodes per assessment
+SCHEMA_CACHE_TTL = 300.0      # seconds a graph schema summary is reused
+
+# Tool results are re-sent to the model on every later round, so keep
+# them small.  The full evidence stays in the retriever context.
+MAX_TOOL_NODES = 25
+MAX_TOOL_RELATIONSHIPS = 50
+
+
+# Retrieval tools are independent Neo4j reads and may run concurrently;
+# workflow tools (assess_and_plan / submit) are always dispatched serially.
+FETCH_TOOLS = frozenset({"search_nodes", "get_neighbors", "get_neighbors_batch", "run_cypher"})
+
+# temperature=0 completions, keyed on model + messages + tools (CACHE_LLM=1)
+_completion_cache = TTLCache(maxsize=1024, ttl=3600)
 
 # ── Tool definitions ─────────────────────────────────────────────────
 
 TOOL_DEFINITIONS = [
-    # Step 1
+    # Steps 1 + 2
     {
         "type": "function",
         "function": {
-            "name": "assess_query",
+            "name": "assess_and_plan",
             "description": (
-                "Step 1: Assess the user's question. Identify the intent, "
-                "entities, time periods, metrics, and any comparisons or "
-                "aggregations required."
+                "Steps 1 and 2: Assess the user's question (intent, entities, "
+                "time periods, metrics, comparisons or aggregations) and, in "
+                "the same call, produce a concrete plan of data items to "
+                "retrieve from the graph. Each item should describe what to "
+                "search for, which tool to use, and why."
             ),
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "intent": {
-                        "type": "string",
-                        "description": (
-                            "High-level intent: lookup_value, compare_values, "
-                            "list_entities, explain_relationship, summarise, etc."
-                        ),
-                    },
-                    "entities_mentioned": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Names of entities the user is asking about.",
-                    },
-                    "time_periods": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Time periods or fiscal years mentioned.",
-                    },
-                    "metrics_or_facts": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Specific metrics, facts, or data points requested.",
+                    "assessment": {
+                        "type": "object",
+                        "properties": {
+                            "intent": {
+                                "type": "string",
+                                "description": (
+                                    "High-level intent: lookup_value, compare_values, "
+                                    "list_entities, explain_relationship, summarise, etc."
+                                ),
+                            },
+                            "entities_mentioned": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Names of entities the user is asking about.",
+                            },
+                            "time_periods": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Time periods or fiscal years mentioned.",
+                            },
+                            "metrics_or_facts": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Specific metrics, facts, or data points requested.",
+                            },
+                        },
+                        "required": ["intent", "entities_mentioned"],
                     },
-                },
-                "required": ["intent", "entities_mentioned"],
-            },
-        },
-    },
-    # Step 2
-    {
-        "type": "function",
-        "function": {
-            "name": "plan_retrieval",
-            "description": (
-                "Step 2: Based on the assessment, produce a concrete plan of "
-                "data items to retrieve from the graph. Each item should "
-                "describe what to search for, which tool to use, and why."
-            ),
-            "parameters": {
-                "type": "object",
-                "properties": {
                     "data_items": {
                         "type": "array",
                         "items": {
@@ -93,7 +113,8 @@ TOOL_DEFINITIONS = [
                                     "type": "string",
                                     "description": (
                                         "Which tool to use: search_nodes, "
-                                        "get_neighbors, or run_cypher."
+                                        "get_neighbors, get_neighbors_batch, "
+                                        "or run_cypher."
                                     ),
                                 },
                             },
@@ -102,7 +123,7 @@ TOOL_DEFINITIONS = [
                         "description": "List of data items needed to answer the query.",
                     },
                 },
-                "required": ["data_items"],
+                "required": ["assessment", "data_items"],
             },
         },
     },
@@ -167,6 +188,41 @@ TOOL_DEFINITIONS = [
             },
         },
     },
+    # Step 3b (several seeds)
+    {
+        "type": "function",
+        "function": {
+            "name": "get_neighbors_batch",
+            "description": (
+                "Step 3 (Fetch): Expand the neighborhoods of several known "
+                "nodes in one call. Prefer this over repeated get_neighbors "
+                "calls when you have more than one entity_id to expand."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "entity_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The entity_ids of the nodes to expand from.",
+                    },
+                    "depth": {
+                        "type": "integer",
+                        "description": "Number of hops (1 or 2). Default 1.",
+                        "default": 1,
+                    },
+                    "rel_type": {
+                        "type": "string",
+                        "description": (
+                            "Optional relationship type to follow. One of: "
+                            + ", ".join(RELATIONSHIP_TYPES)
+                        ),
+                    },
+                },
+                "required": ["entity_ids"],
+            },
+        },
+    },
     # Step 3c
     {
         "type": "function",
@@ -236,6 +292,21 @@ TOOL_DEFINITIONS = [
     },
 ]
 
+# Static per process: format / serialise once at import
+_SYSTEM_PROMPT = AGENT_SYSTEM_PROMPT.format(
+    entity_types=ENTITY_TYPES_JSON,
+    relationship_types=RELATIONSHIP_TYPES_JSON,
+)
+
+# Each round only advertises the tools valid at its step of the workflow:
+# the plan comes first, then retrieval and the final answer.
+_PLANNING_TOOLS = [t for t in TOOL_DEFINITIONS if t["function"]["name"] == "assess_and_plan"]
+_RETRIEVAL_TOOLS = [t for t in TOOL_DEFINITIONS if t["function"]["name"] != "assess_and_plan"]
+_SERIALISED_TOOLS = [
+    (tools, json.dumps(tools, sort_keys=True))
+    for tools in (TOOL_DEFINITIONS, _PLANNING_TOOLS, _RETRIEVAL_TOOLS)
+]
+
 
 # ── Agent class ──────────────────────────────────────────────────────
 
@@ -249,16 +320,32 @@ class QueryAgent:
         with QueryAgent() as agent:
             result = agent.query("What RSUs did Salil Parekh exercise?")
             print(result["answer"])
+
+    The loop itself is a coroutine (``aquery``) running on an event loop
+    owned by the agent, so the async LLM client keeps its connection
+    pool across queries.  ``query`` is the blocking wrapper.
     """
 
     def __init__(self, **neo4j_kwargs) -> None:
         self.retriever = GraphRetriever(**neo4j_kwargs)
-        self.system_prompt = AGENT_SYSTEM_PROMPT.format(
-            entity_types=json.dumps(ENTITY_TYPES, indent=2),
-            relationship_types=json.dumps(RELATIONSHIP_TYPES, indent=2),
+        self._executor = ThreadPoolExecutor(
+            max_workers=MAX_PARALLEL_FETCHES, thread_name_prefix="agent-fetch",
         )
+        self._llm = make_async_client()
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="agent-loop", daemon=True,
+        )
+        self._loop_thread.start()
+        self._schema_cache: tuple[float, str, Any] | None = None     # (time, summary, epoch)
+        self._schema_prompt: tuple[str, str] | None = None     # (schema, prompt)
+        self.system_prompt = _SYSTEM_PROMPT
 
     def query(self, question: str) -> dict:
+        """Blocking wrapper around :meth:`aquery`."""
+        return asyncio.run_coroutine_threadsafe(self._query(question), self._loop).result()
+
+    async def aquery(self, question: str) -> dict:
         """
         Run the full agent workflow for a user question.
 
@@ -276,19 +363,52 @@ class QueryAgent:
                 "graph_context": str,
             }
         """
-        self.retriever.reset_context()
+        if asyncio.get_running_loop() is self._loop:
+            return await self._query(question)
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._query(question), self._loop)
+        )
+
+    def query_batch(
+        self, questions: list[str], max_concurrency: int = MAX_CONCURRENT_QUERIES,
+    ) -> list[dict]:
+        """Blocking wrapper around :meth:`aquery_batch`."""
+        return asyncio.run_coroutine_threadsafe(
+            self._query_batch(questions, max_concurrency), self._loop,
+        ).result()
+
+    async def aquery_batch(
+        self, questions: list[str], max_concurrency: int = MAX_CONCURRENT_QUERIES,
+    ) -> list[dict]:
+        """
+        Answer several questions concurrently, at most ``max_concurrency``
+        agent loops in flight.  Results are returned in input order.
+        """
+        if asyncio.get_running_loop() is self._loop:
+            return await self._query_batch(questions, max_concurrency)
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(
+            self._query_batch(questions, max_concurrency), self._loop,
+        ))
 
-        schema_summary = self.retriever.get_schema_summary()
+    async def _query_batch(self, questions: list[str], max_concurrency: int) -> list[dict]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(question: str) -> dict:
+            async with semaphore:
+                return await self._query(question)
+
+        return await asyncio.gather(*(run_one(q) for q in questions))
+
+    async def _query(self, question: str) -> dict:
+        # Each query collects evidence in its own context so concurrent
+        # queries can share the driver without mixing their results.
+        retriever = self.retriever.fork()
+
+        schema_summary = await self._run_blocking(self.schema_summary)
 
         messages: list[dict] = [
-            {"role": "system", "content": self.system_prompt},
-            {
-                "role": "user",
-                "content": (
-                    f"{question}\n\n"
-                    f"### Current graph contents\n{schema_summary}"
-                ),
-            },
+            {"role": "system", "content": self._system_prompt_with(schema_summary)},
+            {"role": "user", "content": question},
         ]
 
         # Track the workflow state
@@ -297,74 +417,144 @@ class QueryAgent:
         tool_log: list[dict] = []
         final_result: dict | None = None
 
-        for round_num in range(1, MAX_TOOL_ROUNDS + 1):
-            logger.info("Agent round %d …", round_num)
-
-            response = client.chat.completions.create(
-                model=settings.MODEL_NAME,  # type: ignore
-                messages=messages,           # type: ignore[arg-type]
-                tools=TOOL_DEFINITIONS,      # type: ignore[arg-type]
-                tool_choice="auto",
-                temperature=0,
-            )
-
-            assistant_message = response.choices[0].message
-            messages.append(assistant_message)  # type: ignore[arg-type]
-
-            # No tool calls → model decided to answer directly
-            if not assistant_message.tool_calls:
-                if final_result is None:
-                    final_result = {
-                        "has_sufficient_data": True,
-                        "answer": assistant_message.content or "(no answer)",
-                        "confidence": "MEDIUM",
-                        "missing_data": None,
-                    }
-                break
-
-            # Process tool calls
-            for tool_call in assistant_message.tool_calls:
-                fn_name = tool_call.function.name        # type: ignore[union-attr]
-                fn_args = json.loads(tool_call.function.arguments)  # type: ignore[union-attr]
-
-                logger.info("  [%s] %s", fn_name, _truncate(str(fn_args), 120))
-                tool_log.append({"tool": fn_name, "args": fn_args})
-
-                result = self._dispatch(fn_name, fn_args, question)
-
-                # Capture workflow metadata
-                if fn_name == "assess_query":
-                    assessment = fn_args
-                elif fn_name == "plan_retrieval":
-                    plan = fn_args.get("data_items", [])
-                elif fn_name == "submit_answer":
-                    final_result = {
-                        "has_sufficient_data": fn_args.get("has_sufficient_data", False),
-                        "answer": fn_args.get("answer", ""),
-                        "confidence": fn_args.get("confidence", "LOW"),
-                        "missing_data": fn_args.get("missing_data"),
-                    }
-
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": json.dumps(result, default=str),
-                })
+        # Early-termination bookkeeping
+        max_rounds = MAX_TOOL_ROUNDS
+        seen_evidence: set = set()
+        stale_rounds = 0
+        previous_fetches: set[tuple[str, str]] = set()
+
+        # Speculative search_nodes lookups for the entities named in the
+        # assessment, keyed like the calls they stand in for.  They run
+        # against a scratch context; their nodes only reach this query's
+        # context once a tool call is served from them.
+        prefetched: dict[tuple[str, str], asyncio.Future] = {}
+
+        try:
+            round_num = 0
+            while round_num < max_rounds:
+                round_num += 1
+                logger.info("Agent round %d …", round_num)
+
+                # Retrieval calls are started as soon as their arguments have
+                # streamed in, while the model is still decoding the rest
+                # (identical calls within the turn share a single fetch).
+                fetches: dict[str, asyncio.Future] = {}        # tool_call_id → result
+                unique: dict[tuple[str, str], asyncio.Future] = {}
+
+                def start_fetch(call: dict) -> None:
+                    fn = call["function"]
+                    if fn["name"] == "assess_and_plan":
+                        self._prefetch_entities(orjson.loads(fn["arguments"]), retriever, prefetched)
+                        return
+                    if fn["name"] not in FETCH_TOOLS:
+                        return
+                    args = orjson.loads(fn["arguments"])
+                    key = (fn["name"], _canonical_args(fn["name"], args))
+                    if key in unique:
+                        logger.info("  [%s] duplicate call in turn, reusing result", fn["name"])
+                    elif key in prefetched:
+                        logger.info("  [%s] served by prefetch", fn["name"])
+                        unique[key] = asyncio.ensure_future(
+                            _serve_prefetched(prefetched.pop(key), retriever),
+                        )
+                    else:
+                        unique[key] = asyncio.ensure_future(self._run_blocking(
+                            self._dispatch, fn["name"], args, retriever,
+                        ))
+                    fetches[call["id"]] = unique[key]
+
+                tools = _PLANNING_TOOLS if plan is None else _RETRIEVAL_TOOLS
+                assistant_message = await self._completion(
+                    messages, tools, on_tool_call=start_fetch,
+                )
+                messages.append(assistant_message)
+
+                # No tool calls → model decided to answer directly
+                if not assistant_message.get("tool_calls"):
+                    if final_result is None:
+                        final_result = {
+                            "has_sufficient_data": True,
+                            "answer": assistant_message.get("content") or "(no answer)",
+                            "confidence": "MEDIUM",
+                            "missing_data": None,
+                        }
+                    break
 
-                if fn_name == "submit_answer":
+                # Process tool calls
+                calls = [
+                    (tool_call, tool_call["function"]["name"],
+                     orjson.loads(tool_call["function"]["arguments"]))
+                    for tool_call in assistant_message["tool_calls"]
+                ]
+
+                # Consume results in the original order so each tool message
+                # stays paired with its tool_call_id
+                new_evidence: set = set()
+                for tool_call, fn_name, fn_args in calls:
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("  [%s] %s", fn_name, _truncate(_ARGS_REPR.repr(fn_args), 120))
+                    tool_log.append({"tool": fn_name, "args": fn_args})
+
+                    if tool_call["id"] in fetches:
+                        result = await fetches[tool_call["id"]]
+                        new_evidence |= _evidence_keys(result) - seen_evidence
+                    else:
+                        result = self._dispatch(fn_name, fn_args, retriever)
+
+                    # Capture workflow metadata
+                    if fn_name == "assess_and_plan":
+                        assessment = fn_args.get("assessment")
+                        plan = fn_args.get("data_items", [])
+                    elif fn_name == "submit_answer":
+                        final_result = {
+                            "has_sufficient_data": fn_args.get("has_sufficient_data", False),
+                            "answer": fn_args.get("answer", ""),
+                            "confidence": fn_args.get("confidence", "LOW"),
+                            "missing_data": fn_args.get("missing_data"),
+                        }
+
+                    messages.append({
+                        "role": "tool",
+                        "tool_call_id": tool_call["id"],
+                        "content": _tool_content(result),
+                    })
+
+                    if fn_name == "submit_answer":
+                        break
+
+                if final_result and final_result.get("answer"):
                     break
 
-            if final_result and final_result.get("answer"):
-                break
+                # Stop a stalled agent early: the same fetches as last round, or
+                # two fetch rounds in a row that surfaced nothing new.
+                if unique:
+                    seen_evidence |= new_evidence
+                    stale_rounds = 0 if new_evidence else stale_rounds + 1
+                    repeated = unique.keys() <= previous_fetches
+                    previous_fetches = set(unique)
+                    if (repeated or stale_rounds >= 2) and max_rounds > round_num + 1:
+                        logger.info(
+                            "Agent stalled (repeated=%s, stale_rounds=%d); nudging to answer.",
+                            repeated, stale_rounds,
+                        )
+                        # A user turn: several providers reject (or drop) system
+                        # messages after the conversation has started
+                        messages.append({"role": "user", "content": STALLED_RETRIEVAL_NUDGE})
+                        max_rounds = round_num + 1
+
+        finally:
+            # Speculative lookups nobody asked for
+            for future in prefetched.values():
+                future.cancel()
 
         # If we exhausted rounds without a final answer, force one
         if final_result is None:
             logger.warning("Agent hit max rounds, forcing answer generation.")
-            final_result = self._force_answer(question)
+            final_result = await self._force_answer(question, retriever)
 
         # If the agent submitted but answer is empty, generate from context
         if final_result and not final_result.get("answer") and final_result.get("has_sufficient_data"):
-            generated = self._generate_answer_from_context(question)
+            generated = await self._generate_answer_from_context(question, retriever)
             final_result["answer"] = generated
 
         return {
@@ -376,92 +566,280 @@ class QueryAgent:
             "assessment": assessment,
             "plan": plan,
             "tool_calls": tool_log,
-            "graph_context": self.retriever.context.to_text(),
+            "graph_context": retriever.context.to_text_cached(),
         }
 
-    # ── Tool dispatch ─────────────────────────────────────────────────
+    # ── Graph schema ──────────────────────────────────────────────────
 
-    def _dispatch(self, name: str, args: dict, question: str) -> dict:
-        if name == "assess_query":
-            return {"status": "ok", "message": "Assessment recorded. Proceed to plan_retrieval."}
+    def schema_summary(self, refresh: bool = False) -> str:
+        """
+        Graph schema summary, reused for ``SCHEMA_CACHE_TTL`` seconds or
+        until the graph is re-ingested.
+        """
+        epoch = self.retriever.graph_epoch()
+        cached = self._schema_cache
+        if (not refresh and cached and cached[2] == epoch
+                and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL):
+            return cached[1]
+        summary = self.retriever.get_schema_summary()
+        self._schema_cache = (time.monotonic(), summary, epoch)
+        return summary
+
+    def warmup(self, ping_llm: bool = False) -> None:
+        """
+        Do the first query's one-off setup now: fetch and cache the graph
+        schema (and its system prompt), which also opens the Neo4j pool.
+
+        ``ping_llm`` additionally sends a one-token (billed) LLM request,
+        so connection and credential errors surface here instead of on
+        the first question.
+        """
+        async def warm() -> None:
+            schema = self._run_blocking(self.schema_summary)
+            if ping_llm:
+                schema_summary, _ = await asyncio.gather(
+                    schema,
+                    self._llm.chat.completions.create(
+                        model=settings.MODEL_NAME,  # type: ignore
+                        messages=[{"role": "user", "content": "ping"}],
+                        max_tokens=1,
+                    ),
+                )
+            else:
+                schema_summary = await schema
+            self._system_prompt_with(schema_summary)
+
+        asyncio.run_coroutine_threadsafe(warm(), self._loop).result()
+
+    def invalidate_schema(self) -> None:
+        """Drop the cached schema summary (call after ingesting new data)."""
+        self._schema_cache = None
+        self._schema_prompt = None
+
+    def _system_prompt_with(self, schema_summary: str) -> str:
+        """
+        System prompt with the graph schema appended.
 
-        elif name == "plan_retrieval":
+        Keeping everything static in the system message makes the prompt
+        prefix byte-identical across queries, so provider-side prefix
+        caching applies; it is only rebuilt when the schema changes.
+        """
+        cached = self._schema_prompt
+        if cached and cached[0] == schema_summary:
+            return cached[1]
+        prompt = f"{self.system_prompt}\n### Current graph contents\n{schema_summary}\n"
+        self._schema_prompt = (schema_summary, prompt)
+        return prompt
+
+    # ── Tool dispatch ─────────────────────────────────────────────────
+
+    def _dispatch(self, name: str, args: dict, retriever: GraphRetriever) -> dict:
+        if name == "assess_and_plan":
             items = args.get("data_items", [])
             return {
                 "status": "ok",
                 "items_planned": len(items),
-                "message": f"Plan recorded with {len(items)} item(s). Proceed to fetch data.",
+                "message": (
+                    f"Assessment and plan recorded with {len(items)} item(s). "
+                    "Proceed to fetch data."
+                ),
             }
 
         elif name == "search_nodes":
-            nodes = self.retriever.search_nodes(
+            nodes = retriever.search_nodes(
                 query=args["query"],
                 entity_type=args.get("entity_type"),
             )
-            return {"nodes_found": len(nodes), "nodes": _compact_nodes(nodes)}
+            return _search_nodes_result(nodes)
 
         elif name == "get_neighbors":
-            result = self.retriever.get_neighbors(
+            result = retriever.get_neighbors(
                 entity_id=args["entity_id"],
                 depth=args.get("depth", 1),
                 rel_type=args.get("rel_type"),
             )
+            compact = _compact_nodes(result.get("nodes", []))
+            rels = _compact_relationships(result.get("relationships", []))
+            return {
+                "nodes_found": len(compact),
+                "relationships_found": len(rels),
+                **_capped("nodes", compact, MAX_TOOL_NODES),
+                **_capped("relationships", rels, MAX_TOOL_RELATIONSHIPS),
+            }
+
+        elif name == "get_neighbors_batch":
+            results = retriever.get_neighbors_batch(
+                entity_ids=args["entity_ids"],
+                depth=args.get("depth", 1),
+                rel_type=args.get("rel_type"),
+            )
+            compact = _compact_nodes([n for r in results.values() for n in r["nodes"]])
+            rels = _compact_relationships(
+                [rel for r in results.values() for rel in r["relationships"]]
+            )
             return {
-                "nodes_found": len(result.get("nodes", [])),
-                "relationships_found": len(result.get("relationships", [])),
-                "nodes": _compact_nodes(result.get("nodes", [])),
-                "relationships": result.get("relationships", []),
+                "seeds_expanded": sum(1 for r in results.values() if r["nodes"]),
+                "nodes_found": len(compact),
+                "relationships_found": len(rels),
+                **_capped("nodes", compact, MAX_TOOL_NODES),
+                **_capped("relationships", rels, MAX_TOOL_RELATIONSHIPS),
             }
 
         elif name == "run_cypher":
-            rows = self.retriever.run_cypher(
+            rows = retriever.run_cypher(
                 cypher=args["cypher"],
                 params=args.get("params"),
             )
             return {"rows_returned": len(rows), "rows": rows}
 
         elif name == "submit_answer":
-            return {
-                "status": "ok",
-                "message": "Answer submitted.",
-                "graph_evidence_summary": self.retriever.context.to_text()[:500],
-            }
+            return {"status": "ok", "message": "Answer submitted."}
 
         else:
             return {"error": f"Unknown tool: {name}"}
 
+    def _prefetch_entities(
+        self,
+        args: dict,
+        retriever: GraphRetriever,
+        prefetched: dict[tuple[str, str], asyncio.Future],
+    ) -> None:
+        """
+        Start ``search_nodes`` for each entity in an ``assess_and_plan``
+        call, so the first fetch round usually finds its results ready.
+        Each runs on a fork of ``retriever`` and resolves to
+        ``(nodes, tool_result)``; see ``_serve_prefetched``.
+        """
+        assessment = args.get("assessment") or {}
+        entities = [e for e in assessment.get("entities_mentioned", []) if isinstance(e, str)]
+        for entity in entities[:MAX_PREFETCH_ENTITIES]:
+            search_args = {"query": entity}
+            key = ("search_nodes", _canonical_args("search_nodes", search_args))
+            if key not in prefetched:
+                prefetched[key] = asyncio.ensure_future(self._run_blocking(
+                    _prefetch_search, entity, retriever.fork(),
+                ))
+
+    def invalidate_cache(self) -> None:
+        """Drop cached retrievals and schema (call after ingesting new data)."""
+        self.retriever.invalidate_cache()
+        self.invalidate_schema()
+
     # ── Fallback answer generation ────────────────────────────────────
 
-    def _force_answer(self, question: str) -> dict:
+    async def _force_answer(self, question: str, retriever: GraphRetriever) -> dict:
         """Generate an answer from accumulated context when agent stalls."""
-        answer = self._generate_answer_from_context(question)
+        answer = await self._generate_answer_from_context(question, retriever)
         return {
-            "has_sufficient_data": not self.retriever.context.is_empty(),
+            "has_sufficient_data": not retriever.context.is_empty(),
             "answer": answer,
             "confidence": "LOW",
             "missing_data": "Agent reached maximum rounds before completing workflow.",
         }
 
-    def _generate_answer_from_context(self, question: str) -> str:
+    async def _generate_answer_from_context(
+        self, question: str, retriever: GraphRetriever,
+    ) -> str:
         """Call the LLM to synthesise an answer from graph evidence."""
-        graph_context = self.retriever.context.to_text()
+        graph_context = retriever.context.to_text_cached()
 
         prompt = ANSWER_PROMPT.format(
             graph_context=graph_context,
             question=question,
         )
 
-        response = client.chat.completions.create(
+        message = await self._completion([{"role": "user", "content": prompt}])
+        return message.get("content") or "(no answer)"
+
+    async def _completion(
+        self,
+        messages: list[dict],
+        tools: list[dict] | None = None,
+        on_tool_call: Callable[[dict], None] | None = None,
+    ) -> dict:
+        """
+        One streamed temperature=0 chat completion.
+
+        Returns the assistant message as a plain dict (``role``,
+        ``content``, ``tool_calls``).  ``on_tool_call`` is invoked for each
+        tool call as soon as its arguments form complete JSON, before the
+        rest of the response has been decoded.
+
+        With ``CACHE_LLM=1`` identical (model, messages, tools) requests
+        are served from an in-process LRU/TTL cache.
+        """
+        key = None
+        if settings.CACHE_LLM:
+            key = _completion_key(messages, tools)
+            cached = _completion_cache.get(key)
+            if cached is not None:
+                logger.info("LLM cache hit.")
+                if on_tool_call:
+                    for call in cached.get("tool_calls", []):
+                        on_tool_call(call)
+                return cached
+
+        kwargs: dict[str, Any] = {}
+        if tools:
+            kwargs.update(tools=tools, tool_choice="auto")
+        stream = await self._llm.chat.completions.create(
             model=settings.MODEL_NAME,  # type: ignore
-            messages=[{"role": "user", "content": prompt}],
+            messages=messages,           # type: ignore[arg-type]
             temperature=0,
+            stream=True,
+            **kwargs,
         )
 
-        return response.choices[0].message.content or "(no answer)"
+        content: list[str] = []
+        calls: dict[int, dict] = {}          # stream index → tool call
+        announced: set[int] = set()
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content.append(delta.content)
+            for part in delta.tool_calls or []:
+                call = calls.setdefault(part.index, {
+                    "id": None,
+                    "type": "function",
+                    "function": {"name": "", "arguments": ""},
+                })
+                if part.id:
+                    call["id"] = part.id
+                if part.function:
+                    call["function"]["name"] += part.function.name or ""
+                    call["function"]["arguments"] += part.function.arguments or ""
+                if (on_tool_call and part.index not in announced
+                        and _is_complete_json(call["function"]["arguments"])):
+                    announced.add(part.index)
+                    on_tool_call(call)
+
+        message: dict = {"role": "assistant", "content": "".join(content) or None}
+        if calls:
+            message["tool_calls"] = [calls[i] for i in sorted(calls)]
+            if on_tool_call:
+                for i in sorted(calls.keys() - announced):
+                    if _is_complete_json(calls[i]["function"]["arguments"]):
+                        on_tool_call(calls[i])
+
+        if key is not None:
+            _completion_cache.set(key, message)
+        return message
+
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """Run a blocking (Neo4j) call on the fetch pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
 
     # ── Context manager ───────────────────────────────────────────────
 
     def close(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._llm.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        self._executor.shutdown(wait=True)
         self.retriever.close()
 
     def __enter__(self):
@@ -473,25 +851,123 @@ class QueryAgent:
 
 # ── Helpers ──────────────────────────────────────────────────────────
 
+_COMPACT_EXCLUDED = frozenset(
+    {"entity_id", "entity_type", "name", "sources", "_labels", "_id"}
+)
+
+
 def _compact_nodes(nodes: list[dict]) -> list[dict]:
     """Trim nodes to the fields the LLM needs for reasoning."""
-    compact = []
-    seen: set[str] = set()
+    compact: dict[str, dict] = {}    # entity_id → node, first one wins
     for n in nodes:
         eid = n.get("entity_id", "?")
-        if eid in seen:
+        if eid in compact:
             continue
-        seen.add(eid)
-        compact.append({
+        compact[eid] = {
             "entity_id": eid,
             "type": n.get("entity_type", n.get("_labels", "")),
             "name": n.get("name", eid),
-            **{k: v for k, v in n.items()
-               if k not in ("entity_id", "entity_type", "name",
-                             "sources", "_labels", "_id")},
-        })
+            **{k: v for k, v in n.items() if k not in _COMPACT_EXCLUDED},
+        }
+    return list(compact.values())
+
+
+def _completion_key(messages: list[dict], tools: list[dict] | None) -> str:
+    """Stable digest of everything that determines a temperature=0 completion."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(str(settings.MODEL_NAME).encode())
+    h.update(json.dumps(messages, sort_keys=True, default=str).encode())
+    h.update(_serialise_tools(tools).encode())
+    return h.hexdigest()
+
+
+def _compact_relationships(rels: list[dict]) -> list[dict]:
+    """Keep one representative source document per relationship."""
+    compact = []
+    for r in rels:
+        sources = r.get("sources")
+        if isinstance(sources, list) and len(sources) > 1:
+            r = {**r, "sources": sources[:1]}
+        compact.append(r)
     return compact
 
 
+def _evidence_keys(result: dict) -> set:
+    """Identifiers of the graph evidence carried by one retrieval result."""
+    keys: set = {n.get("entity_id") for n in result.get("nodes", [])}
+    keys.update((r.get("src"), r.get("type"), r.get("tgt"))
+                for r in result.get("relationships", []))
+    keys.update(_tool_content(row) for row in result.get("rows", []) if "error" not in row)
+    return keys
+
+
+def _capped(key: str, items: list, limit: int) -> dict:
+    """``{key: items}``, truncated to ``limit`` with a ``truncated`` flag."""
+    if len(items) <= limit:
+        return {key: items}
+    return {key: items[:limit], "truncated": True}
+
+
+def _search_nodes_result(nodes: list[dict]) -> dict:
+    """The ``search_nodes`` tool result for a list of nodes."""
+    compact = _compact_nodes(nodes)
+    return {
+        "nodes_found": len(compact),
+        **_capped("nodes", compact, MAX_TOOL_NODES),
+    }
+
+
+def _prefetch_search(query: str, scratch: GraphRetriever) -> tuple[list[dict], dict]:
+    """Speculative ``search_nodes`` into a throwaway context."""
+    nodes = scratch.search_nodes(query=query)
+    return nodes, _search_nodes_result(nodes)
+
+
+async def _serve_prefetched(prefetch: asyncio.Future, retriever: GraphRetriever) -> dict:
+    """Answer a tool call from a prefetch, adding its nodes to ``retriever``'s context."""
+    nodes, result = await prefetch
+    retriever.remember(nodes=nodes)
+    return result
+
+
+def _tool_content(result: dict) -> str:
+    """Serialise a tool result for the message history."""
+    return orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _canonical_args(name: str, args: dict) -> str:
+    """Order-independent cache key for tool arguments."""
+    if name == "run_cypher" and isinstance(args.get("cypher"), str):
+        args = {**args, "cypher": " ".join(args["cypher"].split())}
+    return json.dumps(args, sort_keys=True, default=str)
+
+
+def _is_complete_json(text: str) -> bool:
+    """True once streamed tool-call arguments parse as a JSON object."""
+    if not text.rstrip().endswith("}"):
+        return False
+    try:
+        orjson.loads(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _serialise_tools(tools: list[dict] | None) -> str:
+    for known, serialised in _SERIALISED_TOOLS:
+        if tools is known:
+            return serialised
+    return json.dumps(tools, sort_keys=True)
+
+
+# Bounded repr for logging tool arguments: stops stringifying early
+# instead of building the full str() of large nested args.
+_ARGS_REPR = reprlib.Repr()
+_ARGS_REPR.maxstring = 120
+_ARGS_REPR.maxother = 120
+_ARGS_REPR.maxdict = 8
+_ARGS_REPR.maxlist = 8
+
+
 def _truncate(text: str, max_len: int = 100) -> str:
     return text[:max_len] + "…" if len(text) > max_len else text
@@ -1,4 +1,6 @@
 import os
+from functools import lru_cache
+
 from dotenv import load_dotenv
 
 
@@ -17,14 +19,33 @@ class Settings:
         self.OPENAI_API_BASE_URL = os.getenv("OPENAI_API_BASE_URL")
         self.MODEL_NAME = os.getenv("MODEL_NAME")
 
+        # Memoise temperature=0 LLM calls in-process (set CACHE_LLM=1)
+        self.CACHE_LLM = os.getenv("CACHE_LLM", "0") == "1"
+
+        # Mark static system prompts as provider cache breakpoints
+        # (Anthropic via OpenRouter; set PROMPT_CACHE_CONTROL=1)
+        self.PROMPT_CACHE_CONTROL = os.getenv("PROMPT_CACHE_CONTROL", "0") == "1"
+
         # PDF Configuration
         self.PDF_INPUT_DIR = os.getenv("PDF_INPUT_DIR", "./data")
         self.PDF_OUTPUT_DIR = os.getenv("PDF_OUTPUT_DIR", "./output")
 
+        # Filings parsed + extracted concurrently by the pipeline
+        # (one process each; 0 means one per CPU)
+        self.INGEST_N_THREADS = int(os.getenv("INGEST_N_THREADS") or "0")
+
         # Neo4j
         self.NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
         self.NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
         self.NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "testpassword")
+        self.NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+        self.NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide Settings; ``.env`` is read once, on first call."""
+    return Settings()
 
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
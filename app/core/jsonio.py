@@ -0,0 +1,48 @@
+"""
+JSON file I/O
+=============
+Loading and writing of the large stage outputs (parsed and extracted
+documents) that are handed between pipeline stages as JSON files.
+"""
+
+import mmap
+from typing import Any, Iterable
+
+import orjson
+
+
+def load_json(path: str) -> Any:
+    """
+    Parse a JSON file with orjson straight from a read-only memory map,
+    so the file contents are never copied into an intermediate bytes
+    object.
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:          # empty file; let orjson report it
+            return orjson.loads(b"")
+        with mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def dump_json_stream(path: str, header: dict, key: str, items: Iterable[Any]) -> None:
+    """
+    Write ``{**header, key: [*items]}`` as indented JSON, serialising one
+    item at a time.  Only a single item's bytes are held at once, and
+    ``items`` may be a generator that is consumed as the file is written.
+    """
+    opts = orjson.OPT_INDENT_2
+    with open(path, "wb") as f:
+        head = orjson.dumps(header, option=opts)
+        if header:
+            f.write(head[:-2])          # drop the closing "\n}"
+            f.write(b",\n")
+        else:
+            f.write(b"{\n")
+        f.write(b"  " + orjson.dumps(key) + b": [\n")
+        for i, item in enumerate(items):
+            if i:
+                f.write(b",\n")
+            f.write(b"    " + orjson.dumps(item, option=opts).replace(b"\n", b"\n    "))
+        f.write(b"\n  ]\n}")
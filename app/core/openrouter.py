@@ -0,0 +1,28 @@
+"""
+LLM clients
+===========
+OpenAI-compatible clients pointed at the configured OpenRouter base URL.
+
+``client`` is a blocking client for scripts and one-off calls.  Async
+callers (the extractor and the query agent) create their own client with
+``make_async_client()``:
+an ``AsyncOpenAI`` connection pool is bound to the event loop that first
+uses it, so it must not be shared across loops.
+"""
+
+from openai import AsyncOpenAI, OpenAI
+
+from app.core.config import settings
+
+client = OpenAI(
+    api_key=settings.OPENAI_API_KEY,
+    base_url=settings.OPENAI_API_BASE_URL,
+)
+
+
+def make_async_client() -> AsyncOpenAI:
+    """Return a new async client configured from settings."""
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_API_BASE_URL,
+    )
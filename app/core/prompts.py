@@ -63,22 +63,39 @@ Previously seen entity IDs (do NOT re-create these, reuse them in relationships)
 Extract all entities and relationships from the pages above.
 Return ONLY the JSON object described in the system prompt."""
 
+entity_relation_extraction_batch_user_prompt_template = """Document: {document_id}
+Filing Year: {filing_year}
+Previously seen entity IDs (do NOT re-create these, reuse them in relationships):
+{known_entity_ids}
+
+The pages below are split into {window_count} windows.  Treat each window
+as a separate extraction over its own pages.
+
+{window_blocks}
+
+Extract all entities and relationships from each window above.
+Return ONLY a JSON object of the form
+{{"windows": [{{"id": <window id>, "entities": [...], "relationships": [...]}}]}}
+with one item per window, where "entities" and "relationships" follow the
+schema described in the system prompt."""
+
+entity_relation_extraction_window_block_template = """<<WINDOW id={window_id} pages={page_range}>>
+{page_content}
+<<END>>"""
+
 
 # ── Query-time prompts ───────────────────────────────────────────────
 
 query_agent_system_prompt = """You are a financial analyst assistant that answers questions about
 company filings using a Neo4j knowledge graph.
 
-You MUST follow this exact 4-step workflow for every query.  Each step
-corresponds to a tool call you must make in order.
+You MUST follow this exact 4-step workflow for every query.  Steps 1
+and 2 share a single tool call; make the calls in order.
 
-### STEP 1 — ASSESS
-Call `assess_query` with the user's question.  Identify the intent,
+### STEP 1 — ASSESS and STEP 2 — PLAN (one call)
+Call `assess_and_plan` once.  In `assessment`, identify the intent,
 the entities mentioned, the time periods involved, and the metrics or
-facts being asked about.  Return a structured assessment.
-
-### STEP 2 — PLAN
-Call `plan_retrieval` with the assessment.  Produce a concrete list of
+facts being asked about.  In `data_items`, produce a concrete list of
 data items you need from the graph to answer the query.  Each item
 should describe what to search for and why.
 
@@ -86,6 +103,7 @@ should describe what to search for and why.
 Execute one or more of these retrieval tools to gather data:
   - `search_nodes` — find nodes by name (substring match)
   - `get_neighbors` — expand connections from a known node
+  - `get_neighbors_batch` — expand several known nodes in one call
   - `run_cypher` — execute a precise Cypher query
 
 Call as many retrieval tools as needed until every item in your plan
@@ -121,6 +139,10 @@ property, and a `sources` list tracking which documents it came from.
 - NEVER fabricate Cypher syntax — only use standard Neo4j Cypher.
 """
 
+stalled_retrieval_nudge = """Your last retrieval calls returned no new data from the graph.
+Call `submit_answer` now with the evidence you already have, stating
+what is missing if it is insufficient."""
+
 answer_generation_prompt = """You are a financial analyst assistant.
 
 Using ONLY the graph evidence provided below, answer the user's question.
@@ -1,3 +1,5 @@
+import json
+
 ENTITY_TYPES = {
     "Company": ["name", "ticker", "sector", "country", "exchange", "fiscal_year_end"],
     "Segment": ["name", "description", "status", "start_date", "end_date"],
@@ -38,3 +40,11 @@ RELATIONSHIP_TYPES = [
     "COMPONENT_OF",      # Metric → Metric (e.g., LongTermDebt → TotalDebt)
     "ROLL_UP_TO",        # MetricValue → MetricValue (aggregation)
 ]
+
+# Membership checks for validating extracted types
+ENTITY_TYPE_NAMES = frozenset(ENTITY_TYPES)
+RELATIONSHIP_TYPE_SET = frozenset(RELATIONSHIP_TYPES)
+
+# Prompt-ready renderings, shared by the extractor and the query agent
+ENTITY_TYPES_JSON = json.dumps(ENTITY_TYPES, indent=2)
+RELATIONSHIP_TYPES_JSON = json.dumps(RELATIONSHIP_TYPES, indent=2)
@@ -1,19 +1,64 @@
-import json
+import asyncio
 import time
 from collections import deque
 from dataclasses import dataclass, field
 import logging
 from typing import Optional
 
-from app.core.openrouter import client
+import orjson
+
+from app.core.openrouter import make_async_client
 from app.core.prompts import entity_relation_extraction_system_prompt as SYSTEM_PROMPT_TEMPLATE, entity_relation_extraction_user_prompt_template as USER_PROMPT_TEMPLATE
-from app.domain.ontology import ENTITY_TYPES, RELATIONSHIP_TYPES
+from app.core.prompts import (
+    entity_relation_extraction_batch_user_prompt_template as BATCH_USER_PROMPT_TEMPLATE,
+    entity_relation_extraction_window_block_template as WINDOW_BLOCK_TEMPLATE,
+)
+from app.domain.ontology import ENTITY_TYPE_NAMES, ENTITY_TYPES_JSON, RELATIONSHIP_TYPE_SET, RELATIONSHIP_TYPES_JSON
 from app.core.config import settings
+from app.core.jsonio import load_json
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+MAX_CONCURRENT_WINDOWS = 4    # LLM calls in flight per document
+WINDOWS_PER_CALL = 1          # windows packed into one LLM request
+MAX_LLM_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2.0        # seconds, doubled after each failed attempt
+RATE_LIMIT_CALLS = 20         # LLM calls allowed per RATE_LIMIT_WINDOW
+RATE_LIMIT_WINDOW = 60.0      # seconds
+
+# The ontology is fixed, so the system prompt is formatted once per process
+# and is byte-identical on every call -- a stable prefix the provider can
+# cache.  OpenAI does that automatically; Anthropic needs an explicit
+# cache_control breakpoint.
+_SYSTEM_PROMPT = SYSTEM_PROMPT_TEMPLATE.format(
+    entity_types=ENTITY_TYPES_JSON,
+    relationship_types=RELATIONSHIP_TYPES_JSON,
+)
+if settings.PROMPT_CACHE_CONTROL:
+    _SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": [{
+            "type": "text",
+            "text": _SYSTEM_PROMPT,
+            "cache_control": {"type": "ephemeral"},
+        }],
+    }
+else:
+    _SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_PROMPT}
+
+
+def _prebind(template: str, **fields) -> str:
+    """
+    Substitute fixed fields into a ``str.format`` template, escaping braces
+    in the values so the remaining placeholders still format correctly.
+    """
+    for name, value in fields.items():
+        escaped = str(value).replace("{", "{{").replace("}", "}}")
+        template = template.replace("{" + name + "}", escaped)
+    return template
+
+
+@dataclass(slots=True)
 class Entity:
     id: str                        # stable slug, e.g. "company_infosys"
     type: str                      # must be in ENTITY_TYPES
@@ -21,70 +66,143 @@ class Entity:
     source: dict = field(default_factory=dict)      # {document_id, page_num, section}
 
 
-@dataclass
+@dataclass(slots=True)
 class Relationship:
     source_id: str                 # Entity.id
     target_id: str                 # Entity.id
     type: str                      # must be in RELATIONSHIP_TYPES
     properties: dict = field(default_factory=dict)
     source: dict = field(default_factory=dict)
+    # dedup identity, fixed at construction: (source_id, type, target_id, filing_year)
+    key: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.key = (self.source_id, self.type, self.target_id,
+                    self.properties.get("filing_year"))
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionResult:
     document_id: str
     entities: list[Entity] = field(default_factory=list)
     relationships: list[Relationship] = field(default_factory=list)
     errors: list[dict] = field(default_factory=list)  # {pages, message}
+    # id → Entity while windows are merged; ``entities`` is built from it once
+    _entity_index: dict[str, Entity] = field(default_factory=dict, init=False, repr=False)
 
     def to_dict(self) -> dict:
         return {
             "document_id": self.document_id,
             "entities": [
-                {**e.__dict__} for e in self.entities
+                {"id": e.id, "type": e.type, "properties": e.properties, "source": e.source}
+                for e in self.entities
             ],
             "relationships": [
-                {**r.__dict__} for r in self.relationships
+                {
+                    "source_id": r.source_id,
+                    "target_id": r.target_id,
+                    "type": r.type,
+                    "properties": r.properties,
+                    "source": r.source,
+                }
+                for r in self.relationships
             ],
             "errors": self.errors,
         }
 
 
 class EntityRelationExtractor:
-    def __init__(self, parsed_json_path: str, filing_year: str, window_size: int = 3, step_size: int = 2):
+    def __init__(
+        self,
+        parsed_json_path: str | None,
+        filing_year: str,
+        window_size: int = 3,
+        step_size: int = 2,
+        max_concurrent: int = MAX_CONCURRENT_WINDOWS,
+        independent_windows: bool = True,
+        windows_per_call: int = WINDOWS_PER_CALL,
+        parsed_document: dict | None = None,
+        rate_limit: int = RATE_LIMIT_CALLS,
+    ):
         """
         Args:
             parsed_json_path:    Path to the parsed JSON produced by the ingestion module.
+                         Not read when ``parsed_document`` is given.
             window_size: Number of pages per LLM call.
             step_size:   Slide increment. window_size=3, step_size=2 gives
                          [0-2], [2-4], [4-6] ... (1-page overlap between windows).
+            max_concurrent: Windows sent to the LLM at the same time.
+            independent_windows: When False, process windows one at a time
+                         so each call sees every entity id found before it
+                         (the original serial behaviour).
+            windows_per_call: Windows packed into a single LLM request.
+                         Values above 1 cut the request count (and pressure
+                         on the rate limit) at the cost of longer responses.
+            parsed_document: The parsed document itself, as returned by
+                         PDFParser.process_document, to skip the JSON round trip.
+            rate_limit:  LLM calls allowed per ``RATE_LIMIT_WINDOW`` seconds.
+                         Extractors running side by side should split the
+                         provider's budget between them.
         """
         
         self.window_size = window_size
         self.step_size = step_size
+        self.max_concurrent = max(1, max_concurrent)
+        self.independent_windows = independent_windows
+        self.windows_per_call = max(1, windows_per_call)
         self._call_timestamps: deque[float] = deque()
-        self._rate_limit = 20       # max calls per window
-        self._rate_window = 60.0    # seconds
+        self._rate_limit = max(1, rate_limit)   # max calls per window
+        self._rate_window = RATE_LIMIT_WINDOW
 
-        with open(parsed_json_path, "r") as f:
-            self.document_json = json.load(f)
+        if parsed_document is not None:
+            self.document_json = parsed_document
+        elif parsed_json_path is not None:
+            self.document_json = load_json(parsed_json_path)
+        else:
+            raise ValueError("Either parsed_json_path or parsed_document is required")
 
         self.document_id: str = self.document_json["id"]
         self.pages: list[dict] = self.document_json.get("pages", [])
         self.filing_year = filing_year
 
-        # Format the system prompt once with the ontology
-        entity_types_str = json.dumps(ENTITY_TYPES, indent=2)
-        relationship_types_str = json.dumps(RELATIONSHIP_TYPES, indent=2)
-        self.system_prompt = SYSTEM_PROMPT_TEMPLATE.format(
-            entity_types=entity_types_str,
-            relationship_types=relationship_types_str,
+        # document_id / filing_year are fixed per document: substitute them
+        # once, leaving only the per-window fields for str.format
+        self._user_prompt = _prebind(
+            USER_PROMPT_TEMPLATE, document_id=self.document_id, filing_year=filing_year,
         )
+        self._batch_user_prompt = _prebind(
+            BATCH_USER_PROMPT_TEMPLATE, document_id=self.document_id, filing_year=filing_year,
+        )
+
+        # Overlapping windows share pages, so format each page only once
+        self._formatted_pages: list[str] = [self._format_page(page) for page in self.pages]
+        self._page_numbers: list = [page["page_number"] for page in self.pages]
+
+        self.system_prompt = _SYSTEM_PROMPT
 
     def process_document(self) -> ExtractionResult:
         """
         Slide a window over all pages, call the LLM for each window,
         and accumulate a single de-duplicated ExtractionResult.
+
+        Blocking wrapper around ``aprocess_document()``; must not be
+        called from a running event loop.
+        """
+        return asyncio.run(self.aprocess_document())
+
+    async def aprocess_document(self) -> ExtractionResult:
+        """
+        Async version of ``process_document()``.
+
+        With ``independent_windows`` up to ``max_concurrent`` windows are in
+        flight at once.  Each call is told the entity ids found by windows
+        that have already finished; that list is a hint for consistent ids,
+        and duplicates across windows are merged afterwards by id, so
+        windows do not wait on each other.
+
+        Calls produce raw responses into a queue; a single consumer parses
+        them while later calls are still in flight, and merges results in
+        page order.
         """
         result = ExtractionResult(document_id=self.document_id)
         total_pages = len(self.pages)
@@ -96,43 +214,114 @@ class EntityRelationExtractor:
                 windows), self.window_size, self.step_size,
         )
 
-        for start, end in windows:
-            window_pages = self.pages[start:end]
-            
-            page_nums = [page["page_number"] for page in window_pages]
-            page_range = f"{page_nums[0]}-{page_nums[-1]}"
-
-            logger.info("Window pages %s ...", page_range)
-
-            raw_response = self._call_llm(
-                window_pages,
-                known_entity_ids=[e.id for e in result.entities],
-                page_range=page_range,
-            )
-            if raw_response is None:
-                result.errors.append(
-                    {"pages": page_range, "message": "LLM call failed"})
-                continue
-
-            entities, relationships, err = self._parse_llm_response(
-                raw_response)
-            if err:
-                result.errors.append({"pages": page_range, "message": err})
-                continue
-
-            result.entities = self._merge_entities(result.entities, entities)
-            result.relationships.extend(relationships)
-
-            logger.info(
-                "    +%d entities, +%d relationships (totals: %d, %d)",
-                len(entities), len(relationships),
-                len(result.entities), len(result.relationships),
-            )
+        k = self.windows_per_call
+        groups = [windows[i:i + k] for i in range(0, len(windows), k)]
+
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._rate_lock = asyncio.Lock()
+        known_ids: dict[str, None] = {}     # ordered set of ids seen so far
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrent * 2)
+
+        async def produce(index: int, group: list[tuple[int, int]]) -> None:
+            page_ranges = [
+                f"{self._page_numbers[start]}-{self._page_numbers[end - 1]}"
+                for start, end in group
+            ]
+
+            async with semaphore:
+                logger.info("Window pages %s ...", ", ".join(page_ranges))
+                raw_response = await self._call_llm(
+                    llm,
+                    self._build_user_message(group, page_ranges, list(known_ids)),
+                    page_range=", ".join(page_ranges),
+                )
+            await queue.put((index, page_ranges, raw_response))
+
+        async def consume() -> None:
+            # Responses arrive in completion order; hold early ones back
+            # so the merge (and which properties win) stays in page order.
+            pending: dict[int, list] = {}
+            next_index = 0
+            for _ in groups:
+                index, page_ranges, raw_response = await queue.get()
+                try:
+                    outcomes = self._parse_group(page_ranges, raw_response)
+                except Exception as exc:
+                    # e.g. an entity without "id": fail these windows only
+                    logger.warning("Malformed response for pages %s: %s", ", ".join(page_ranges), exc)
+                    outcomes = [
+                        (page_range, [], [], f"Malformed response: {exc!r}")
+                        for page_range in page_ranges
+                    ]
+                for _, entities, _, _ in outcomes:
+                    known_ids.update(dict.fromkeys(e.id for e in entities))
+                pending[index] = outcomes
+                while next_index in pending:
+                    for outcome in pending.pop(next_index):
+                        self._merge_outcome(result, *outcome)
+                    next_index += 1
+                queue.task_done()
+
+        async def produce_all() -> None:
+            if self.independent_windows:
+                await asyncio.gather(*(produce(i, group) for i, group in enumerate(groups)))
+            else:
+                for i, group in enumerate(groups):
+                    await produce(i, group)
+                    await queue.join()      # next call sees this window's ids
 
+        llm = make_async_client()
+        try:
+            producing = asyncio.ensure_future(produce_all())
+            consumer = asyncio.ensure_future(consume())
+            try:
+                await asyncio.gather(producing, consumer)
+            except BaseException:
+                # A dead consumer would leave producers blocked on the
+                # full queue (and vice versa): stop both, then re-raise.
+                producing.cancel()
+                consumer.cancel()
+                await asyncio.gather(producing, consumer, return_exceptions=True)
+                raise
+        finally:
+            await llm.close()
+
+        result.entities = list(result._entity_index.values())
         result.relationships = self._deduplicate_relationships(
             result.relationships)
         return result
 
+    def _parse_group(
+        self, page_ranges: list[str], raw_response: Optional[str],
+    ) -> list[tuple[str, list[Entity], list[Relationship], Optional[str]]]:
+        """Per-window ``(page_range, entities, relationships, error)`` for one call."""
+        if raw_response is None:
+            return [(page_range, [], [], "LLM call failed") for page_range in page_ranges]
+        if len(page_ranges) == 1:
+            return [(page_ranges[0], *self._parse_llm_response(raw_response))]
+        return self._parse_batch_response(raw_response, page_ranges)
+
+    def _merge_outcome(
+        self,
+        result: ExtractionResult,
+        page_range: str,
+        entities: list[Entity],
+        relationships: list[Relationship],
+        err: Optional[str],
+    ) -> None:
+        if err:
+            result.errors.append({"pages": page_range, "message": err})
+            return
+
+        self._merge_entities(result._entity_index, entities)
+        result.relationships.extend(relationships)
+
+        logger.info(
+            "    pages %s: +%d entities, +%d relationships (totals: %d, %d)",
+            page_range, len(entities), len(relationships),
+            len(result._entity_index), len(result.relationships),
+        )
+
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
@@ -148,60 +337,118 @@ class EntityRelationExtractor:
             start += self.step_size
         return windows
 
-    def _call_llm(self, pages: list[dict], known_entity_ids: list[str], page_range: str) -> Optional[str]:
-        # --- rate limiting: max 20 calls per 60 s ---
-        now = time.monotonic()
-        # drop timestamps older than the rolling window
-        while self._call_timestamps and now - self._call_timestamps[0] >= self._rate_window:
-            self._call_timestamps.popleft()
-        if len(self._call_timestamps) >= self._rate_limit:
-            sleep_for = self._rate_window - (now - self._call_timestamps[0])
-            if sleep_for > 0:
-                logger.info("Rate limit reached (%d/%d). Sleeping %.1f s …",
-                            len(self._call_timestamps), self._rate_limit, sleep_for)
-                time.sleep(sleep_for)
-            # refresh timestamps after sleep
+    async def _throttle(self) -> None:
+        """Rolling-window rate limit: max ``_rate_limit`` calls per ``_rate_window`` s."""
+        async with self._rate_lock:
             now = time.monotonic()
+            # drop timestamps older than the rolling window
             while self._call_timestamps and now - self._call_timestamps[0] >= self._rate_window:
                 self._call_timestamps.popleft()
-        self._call_timestamps.append(time.monotonic())
-        # --- end rate limiting ---
+            if len(self._call_timestamps) >= self._rate_limit:
+                sleep_for = self._rate_window - (now - self._call_timestamps[0])
+                if sleep_for > 0:
+                    logger.info("Rate limit reached (%d/%d). Sleeping %.1f s …",
+                                len(self._call_timestamps), self._rate_limit, sleep_for)
+                    await asyncio.sleep(sleep_for)
+                # refresh timestamps after sleep
+                now = time.monotonic()
+                while self._call_timestamps and now - self._call_timestamps[0] >= self._rate_window:
+                    self._call_timestamps.popleft()
+            self._call_timestamps.append(time.monotonic())
+
+    def _build_user_message(
+        self, windows: list[tuple[int, int]], page_ranges: list[str], known_entity_ids: list[str],
+    ) -> str:
+        """User prompt for one window, or for several packed into one request."""
+        if len(windows) == 1:
+            return self._user_prompt.format(
+                known_entity_ids=orjson.dumps(known_entity_ids).decode(),
+                page_range=page_ranges[0],
+                page_content=self._window_content(*windows[0]),
+            )
 
-        page_content = self._format_page_content(pages)
-        
-        user_message = USER_PROMPT_TEMPLATE.format(
-            document_id=self.document_id,
-            known_entity_ids=json.dumps(known_entity_ids),
-            page_range=page_range,
-            page_content=page_content,
-            filing_year=self.filing_year
-        
-        )
-        try:
-            response = client.chat.completions.create(
-                model=settings.MODEL_NAME, # type: ignore
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user",   "content": user_message},
-                ],
-                temperature=0,
-                response_format={"type": "json_object"},
+        window_blocks = "\n\n".join(
+            WINDOW_BLOCK_TEMPLATE.format(
+                window_id=i,
+                page_range=page_range,
+                page_content=self._window_content(start, end),
             )
-            return response.choices[0].message.content
-        except Exception as exc:
-            logger.error("LLM call failed for pages %s: %s", page_range, exc)
-            return None
+            for i, ((start, end), page_range) in enumerate(zip(windows, page_ranges), start=1)
+        )
+        return self._batch_user_prompt.format(
+            known_entity_ids=orjson.dumps(known_entity_ids).decode(),
+            window_count=len(windows),
+            window_blocks=window_blocks,
+        )
+
+    async def _call_llm(self, llm, user_message: str, page_range: str) -> Optional[str]:
+        for attempt in range(1, MAX_LLM_ATTEMPTS + 1):
+            await self._throttle()
+            try:
+                stream = await llm.chat.completions.create(
+                    model=settings.MODEL_NAME, # type: ignore
+                    messages=[
+                        _SYSTEM_MESSAGE,
+                        {"role": "user",   "content": user_message},
+                    ],
+                    temperature=0,
+                    response_format={"type": "json_object"},
+                    stream=True,
+                )
+                # Long extractions take many seconds to generate; a streamed
+                # connection never sits idle long enough to hit read timeouts.
+                content: list[str] = []
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        content.append(chunk.choices[0].delta.content)
+                return "".join(content) or None
+            except Exception as exc:
+                if attempt == MAX_LLM_ATTEMPTS:
+                    logger.error("LLM call failed for pages %s: %s", page_range, exc)
+                    return None
+                delay = RETRY_BASE_DELAY * 2 ** (attempt - 1)
+                logger.warning("LLM call failed for pages %s (%s), retrying in %.0f s",
+                               page_range, exc, delay)
+                await asyncio.sleep(delay)
+        return None
 
     def _parse_llm_response(self, raw: str) -> tuple[list[Entity], list[Relationship], Optional[str]]:
         try:
-            data = json.loads(raw)
-        except json.JSONDecodeError as exc:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError as exc:
             return [], [], f"JSON decode error: {exc} — raw snippet: {raw[:200]}"
 
+        return self._parse_extraction(data)
+
+    def _parse_batch_response(
+        self, raw: str, page_ranges: list[str],
+    ) -> list[tuple[str, list[Entity], list[Relationship], Optional[str]]]:
+        """Split a multi-window response back into per-window results."""
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError as exc:
+            err = f"JSON decode error: {exc} — raw snippet: {raw[:200]}"
+            return [(page_range, [], [], err) for page_range in page_ranges]
+
+        by_id = {}
+        for item in data.get("windows", []):
+            if isinstance(item, dict):
+                by_id[str(item.get("id"))] = item
+
+        outcomes = []
+        for i, page_range in enumerate(page_ranges, start=1):
+            item = by_id.get(str(i))
+            if item is None:
+                outcomes.append((page_range, [], [], "Window missing from batched response"))
+            else:
+                outcomes.append((page_range, *self._parse_extraction(item)))
+        return outcomes
+
+    def _parse_extraction(self, data: dict) -> tuple[list[Entity], list[Relationship], Optional[str]]:
         entities: list[Entity] = []
         for e in data.get("entities", []):
             etype = e.get("type", "")
-            if etype not in ENTITY_TYPES:
+            if etype not in ENTITY_TYPE_NAMES:
                 logger.warning(
                     "Skipping unknown entity type '%s' (id=%s)", etype, e.get("id"))
                 continue
@@ -216,7 +463,7 @@ class EntityRelationExtractor:
         relationships: list[Relationship] = []
         for r in data.get("relationships", []):
             rtype = r.get("type", "")
-            if rtype not in RELATIONSHIP_TYPES:
+            if rtype not in RELATIONSHIP_TYPE_SET:
                 logger.warning(
                     "Skipping unknown relationship type '%s'", rtype)
                 continue
@@ -232,48 +479,38 @@ class EntityRelationExtractor:
         return entities, relationships, None
 
     @staticmethod
-    def _merge_entities(existing: list[Entity], incoming: list[Entity]) -> list[Entity]:
-        """Merge by id — incoming properties win on conflict, no duplicates created."""
-        index = {e.id: e for e in existing}
+    def _merge_entities(index: dict[str, Entity], incoming: list[Entity]) -> None:
+        """Merge by id into ``index`` in place — incoming properties win on conflict."""
         for new in incoming:
             if new.id in index:
                 index[new.id].properties.update(new.properties)
             else:
                 index[new.id] = new
-        return list(index.values())
 
     @staticmethod
     def _deduplicate_relationships(rels: list[Relationship]) -> list[Relationship]:
         """Remove exact duplicate triples that arise from window overlaps."""
-        seen: set[tuple] = set()
-        unique: list[Relationship] = []
-        for r in rels:
-            key = (r.source_id,
-                   r.type,
-                   r.target_id,
-                   r.properties.get("filing_year"),
-                )
-            if key not in seen:
-                seen.add(key)
-                unique.append(r)
-        return unique
+        # Walk backwards so each key ends up mapped to its first occurrence,
+        # then emit in first-seen order.
+        first = {r.key: r for r in reversed(rels)}
+        return [first[key] for key in dict.fromkeys(r.key for r in rels)]
+
+    def _window_content(self, start: int, end: int) -> str:
+        """Page text for pages[start:end], pages separated by a blank line."""
+        page_blocks = [text for text in self._formatted_pages[start:end] if text]
+        return "\n\n".join(page_blocks) if page_blocks else "(no extractable text)"
 
     @staticmethod
-    def _format_page_content(pages: list[dict]) -> str:
-        page_blocks = []
-        for page in pages:
-            # Concatenate all block contents from the page
-            block_contents = []
-            for block in page.get("blocks", []):
-                content = block.get("content", "").strip()
-                if content:
-                    block_contents.append(content)
-            
-            if block_contents:
-                page_text = "\n".join(block_contents)
-                page_blocks.append(f"[Page {page['page_number']}]\n{page_text}")
-        
-        return "\n\n".join(page_blocks) if page_blocks else "(no extractable text)"
+    def _format_page(page: dict) -> str:
+        """``[Page N]`` followed by the page's non-empty blocks, or "" if none."""
+        buf: list[str] = []
+        for block in page.get("blocks", []):
+            content = block.get("content", "").strip()
+            if content:
+                buf.append(content)
+        if not buf:
+            return ""
+        return f"[Page {page['page_number']}]\n" + "\n".join(buf)
 
     # ------------------------------------------------------------------
     # Context manager
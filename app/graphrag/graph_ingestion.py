@@ -13,32 +13,67 @@ Entity resolution strategy
    have names with a RapidFuzz token_sort_ratio ≥ FUZZY_THRESHOLD,
    the incoming entity is remapped to the existing ID.  This catches
    cases like ``company_infosys`` vs ``company_infosys_limited``.
+   Only names sharing a character trigram with the incoming name are
+   scored, so a lookup does not scan every entity of the type.  Incoming
+   names that share a candidate set are scored together with one
+   RapidFuzz ``cdist`` call.
 3. All relationship source/target IDs are remapped through the
    resolved alias table before writing to Neo4j.
 """
 
-import json
 import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterator, Optional
 
+import orjson
 from neo4j import GraphDatabase, Driver
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
 from app.core.config import settings
+from app.core.jsonio import load_json
+from app.graphrag.graph_retrieval import INGEST_EPOCH_LABEL, NAME_FULLTEXT_INDEX
 
 logger = logging.getLogger(__name__)
 
 # ── Tuneable knobs ────────────────────────────────────────────────────
 FUZZY_THRESHOLD = 88          # token_sort_ratio score to treat names as same entity
-BATCH_SIZE = 200              # Neo4j UNWIND batch size
+BATCH_SIZE = 1000             # Neo4j UNWIND batch size
+WRITE_WORKERS = 4             # concurrent write sessions per writer
 # ──────────────────────────────────────────────────────────────────────
 
+# Write statements.  Labels and relationship types cannot be parameters,
+# so they are filled in from the ontology's closed set of types; all data
+# goes through $parameters, leaving Neo4j one cached plan per type.
+_ENTITY_CONSTRAINT = (
+    "CREATE CONSTRAINT IF NOT EXISTS "
+    "FOR (n:`{label}`) REQUIRE n.entity_id IS UNIQUE"
+)
+_ENTITY_MERGE = (
+    "UNWIND $rows AS row "
+    "MERGE (n:`{label}` {{entity_id: row.entity_id}}) "
+    "ON CREATE SET n.entity_type = $entity_type "
+    "SET n += row.props, "
+    "    n.sources = row.sources "
+)
+_BUMP_INGEST_EPOCH = (
+    f"MERGE (m:`{INGEST_EPOCH_LABEL}` {{key: 'ingest'}}) "
+    "SET m.epoch = timestamp()"
+)
+_RELATIONSHIP_MERGE = (
+    "UNWIND $rows AS row "
+    "MATCH (a{src_label} {{entity_id: row.src_id}}), "
+    "(b{tgt_label} {{entity_id: row.tgt_id}}) "
+    "MERGE (a)-[r:`{rel_type}`]->(b) "
+    "SET r += row.props, "
+    "    r.sources = row.sources "
+)
+
 
 # ── Lightweight data containers ───────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class ResolvedEntity:
     """An entity after ID-resolution, ready for Neo4j."""
     id: str
@@ -47,7 +82,7 @@ class ResolvedEntity:
     sources: list = field(default_factory=list)       # list of {document_id, page_num, section}
 
 
-@dataclass
+@dataclass(slots=True)
 class ResolvedRelationship:
     """A relationship whose source/target IDs have been resolved."""
     source_id: str
@@ -76,9 +111,15 @@ class EntityResolver:
         # canonical_id → ResolvedEntity
         self._registry: dict[str, ResolvedEntity] = {}
         
-        # type → {canonical_id: name}  (for fuzzy lookup)
+        # type → {canonical_id: lowercased name}  (for fuzzy lookup)
         self._name_index: dict[str, dict[str, str]] = defaultdict(dict)
 
+        # type → {trigram: {canonical_id, ...}}  (fuzzy candidate blocking)
+        self._trigram_index: dict[str, dict[str, set[str]]] = defaultdict(lambda: defaultdict(set))
+
+        # canonical_id → registration order (deterministic fuzzy tie-breaks)
+        self._rank: dict[str, int] = {}
+
     # ── public API ────────────────────────────────────────────────────
 
     def resolve(self, entities: list[dict]) -> tuple[list[ResolvedEntity], dict[str, str]]:
@@ -87,15 +128,21 @@ class EntityResolver:
         extraction JSON) and return (resolved_entities, alias_map).
         """
         alias_map: dict[str, str] = {}
+        prescored = self._score_against_registry(entities)
 
-        for raw in entities:
+        # type → {entity_id: lowercased name} registered during this call,
+        # which the registry snapshot scored above does not include
+        fresh: dict[str, dict[str, str]] = defaultdict(dict)
+
+        for raw, best in zip(entities, prescored):
             raw_id: str = raw["id"]
             etype: str = raw["type"]
             props: dict = raw.get("properties", {})
             source: dict = raw.get("source", {})
             name: str = props.get("name", raw_id)
+            name_lower = name.lower()
 
-            canonical_id = self._find_canonical(raw_id, etype, name)
+            canonical_id = self._find_canonical(raw_id, etype, name, name_lower, best, fresh[etype])
 
             if canonical_id is None:
                 # brand-new entity
@@ -106,7 +153,12 @@ class EntityResolver:
                     sources=[source] if source else [],
                 )
                 self._registry[raw_id] = entity
-                self._name_index[etype][raw_id] = name
+                self._rank[raw_id] = len(self._rank)
+                self._name_index[etype][raw_id] = name_lower
+                trigrams = self._trigram_index[etype]
+                for gram in _trigrams(name_lower):
+                    trigrams[gram].add(raw_id)
+                fresh[etype][raw_id] = name_lower
                 alias_map[raw_id] = raw_id
             else:
                 # merge into existing canonical entity
@@ -119,25 +171,103 @@ class EntityResolver:
         resolved = list(self._registry.values())
         return resolved, alias_map
 
+    def entity_types(self) -> dict[str, str]:
+        """Type of every entity registered so far, by canonical ID."""
+        return {eid: entity.type for eid, entity in self._registry.items()}
+
     # ── private helpers ───────────────────────────────────────────────
 
-    def _find_canonical(self, raw_id: str, etype: str, name: str) -> Optional[str]:
-        """Return the canonical ID this entity should merge into, or None."""
+    def _score_against_registry(self, entities: list[dict]) -> list[Optional[tuple[str, float]]]:
+        """
+        Best fuzzy match, as ``(canonical_id, score)``, among the names
+        registered before this batch for each incoming entity.  Each query
+        is scored only against its own trigram candidates; queries sharing
+        a candidate set are scored together in one ``cdist`` call.
+        """
+        best: list[Optional[tuple[str, float]]] = [None] * len(entities)
+
+        # (type, candidate IDs) → [(position, query), ...]
+        groups: dict[tuple[str, tuple[str, ...]], list[tuple[int, str]]] = defaultdict(list)
+        for i, raw in enumerate(entities):
+            if raw["id"] in self._registry:
+                continue
+            etype = raw["type"]
+            query = raw.get("properties", {}).get("name", raw["id"]).lower()
+            choice_ids = self._candidates(etype, query)
+            if choice_ids:
+                groups[(etype, choice_ids)].append((i, query))
+
+        for (etype, choice_ids), members in groups.items():
+            names = self._name_index[etype]
+            scores = process.cdist(
+                [query for _, query in members],
+                [names[cid] for cid in choice_ids],
+                scorer=fuzz.token_sort_ratio,
+                score_cutoff=self.threshold,
+                workers=-1,
+            )
+            for (i, _), row in zip(members, scores):
+                j = int(row.argmax())
+                if row[j] > 0:      # scores below the cutoff come back as 0
+                    best[i] = (choice_ids[j], float(row[j]))
+
+        return best
+
+    def _candidates(
+        self, etype: str, name_lower: str, within: Optional[dict[str, str]] = None,
+    ) -> tuple[str, ...]:
+        """
+        Registered IDs of ``etype`` sharing a trigram with ``name_lower``
+        (restricted to ``within`` if given), in registration order: string
+        hashes vary per process, and ties must go to the earliest entity.
+        """
+        trigrams = self._trigram_index[etype]
+        found: set[str] = set()
+        for gram in _trigrams(name_lower):
+            found |= trigrams.get(gram, set())
+        if within is not None:
+            found &= within.keys()
+        return tuple(sorted(found, key=self._rank.__getitem__))
+
+    def _find_canonical(
+        self,
+        raw_id: str,
+        etype: str,
+        name: str,
+        name_lower: str,
+        prescored: Optional[tuple[str, float]],
+        fresh: dict[str, str],
+    ) -> Optional[str]:
+        """
+        Return the canonical ID this entity should merge into, or None.
+
+        ``prescored`` is the best match from the registry snapshot;
+        ``fresh`` holds same-type names registered earlier in this batch.
+        """
         # 1. exact ID match
         if raw_id in self._registry:
             return raw_id
 
         # 2. fuzzy name match within the same entity type
-        for cid, cname in self._name_index.get(etype, {}).items():
-            score = fuzz.token_sort_ratio(name.lower(), cname.lower())
-            if score >= self.threshold:
-                logger.info(
-                    "Entity resolution: '%s' (id=%s) ≈ '%s' (id=%s)  score=%d",
-                    name, raw_id, cname, cid, score,
-                )
-                return cid
-
-        return None
+        best = prescored
+        choice_ids = self._candidates(etype, name_lower, fresh) if fresh else ()
+        if choice_ids:
+            match = process.extractOne(
+                name_lower, {cid: fresh[cid] for cid in choice_ids},
+                scorer=fuzz.token_sort_ratio,
+                score_cutoff=self.threshold,
+            )
+            if match is not None and (best is None or match[1] > best[1]):
+                best = (match[2], match[1])
+        if best is None:
+            return None
+
+        cid, score = best
+        logger.info(
+            "Entity resolution: '%s' (id=%s) ≈ '%s' (id=%s)  score=%d",
+            name, raw_id, self._name_index[etype][cid], cid, score,
+        )
+        return cid
 
 
 # ── Neo4j writer ─────────────────────────────────────────────────────
@@ -145,71 +275,104 @@ class EntityResolver:
 class Neo4jWriter:
     """Thin wrapper around the Neo4j driver to write entities and relationships."""
 
-    def __init__(self, driver: Driver) -> None:
+    def __init__(self, driver: Driver, max_workers: int = WRITE_WORKERS) -> None:
         self.driver = driver
+        self.max_workers = max(1, max_workers)
 
     # ── public API ────────────────────────────────────────────────────
 
     def ensure_constraints(self) -> None:
         """Create uniqueness constraints so MERGE is efficient."""
-        with self.driver.session() as session:
+        with self.driver.session(database=settings.NEO4J_DATABASE) as session:
             # one constraint per entity type gives us fast MERGE by entity_id
             for etype in _all_entity_types():
-                cypher = (
-                    f"CREATE CONSTRAINT IF NOT EXISTS "
-                    f"FOR (n:`{etype}`) REQUIRE n.entity_id IS UNIQUE"
-                )
-                session.run(cypher)
+                session.run(_ENTITY_CONSTRAINT.format(label=etype))
             logger.info("Neo4j uniqueness constraints ensured.")
 
     def write_entities(self, entities: list[ResolvedEntity]) -> int:
         """MERGE entity nodes into Neo4j.  Returns count written."""
-        batches = _make_batches(entities, BATCH_SIZE)
-        total = 0
-        with self.driver.session() as session:
-            for batch in batches:
-                for entity in batch:
-                    params = {
-                        "entity_id": entity.id,
-                        "props": _clean_props(entity.properties),
-                        "sources": entity.sources,
-                        "entity_type": entity.type,
-                    }
-                    # Dynamic label via APOC-free approach: MERGE then SET label
-                    cypher = (
-                        "MERGE (n {entity_id: $entity_id}) "
-                        "SET n += $props, "
-                        "    n.entity_type = $entity_type, "
-                        "    n.sources = [s IN $sources | s.document_id] "
-                        f"SET n:`{entity.type}` "
-                    )
-                    session.run(cypher, params)
-                    total += 1
+        # Group by type so each UNWIND can use a static label
+        rows_by_type: dict[str, list[dict]] = defaultdict(list)
+        for entity in entities:
+            rows_by_type[entity.type].append({
+                "entity_id": entity.id,
+                "props": _clean_props(entity.properties),
+                "sources": _source_documents(entity.sources),
+            })
+
+        jobs = []
+        for etype, rows in rows_by_type.items():
+            cypher = _ENTITY_MERGE.format(label=etype)
+            jobs.extend(
+                (cypher, batch, {"entity_type": etype})
+                for batch in _make_batches(rows, BATCH_SIZE)
+            )
+        total = self._run_jobs(jobs)
         logger.info("Wrote %d entity nodes.", total)
         return total
 
-    def write_relationships(self, relationships: list[ResolvedRelationship]) -> int:
-        """MERGE relationship edges into Neo4j.  Returns count written."""
-        total = 0
-        with self.driver.session() as session:
-            for rel in relationships:
-                params = {
-                    "src_id": rel.source_id,
-                    "tgt_id": rel.target_id,
-                    "props": _clean_props(rel.properties),
-                    "sources": rel.sources,
-                }
-                cypher = (
-                    "MATCH (a {entity_id: $src_id}), (b {entity_id: $tgt_id}) "
-                    f"MERGE (a)-[r:`{rel.type}`]->(b) "
-                    "SET r += $props, "
-                    "    r.sources = [s IN $sources | s.document_id] "
-                )
-                session.run(cypher, params)
-                total += 1
+    def write_relationships(
+        self,
+        relationships: list[ResolvedRelationship],
+        entity_types: dict[str, str] | None = None,
+    ) -> int:
+        """
+        MERGE relationship edges into Neo4j.  Returns count written.
+
+        ``entity_types`` maps entity IDs to their type; endpoints found
+        there are MATCHed by label, so the lookup uses the per-type
+        ``entity_id`` constraint instead of scanning every node.  Other
+        endpoints (e.g. nodes written by an earlier run) are MATCHed
+        without a label.
+        """
+        entity_types = entity_types or {}
+        rows_by_key: dict[tuple, list[dict]] = defaultdict(list)
+        for rel in relationships:
+            key = (rel.type, entity_types.get(rel.source_id), entity_types.get(rel.target_id))
+            rows_by_key[key].append({
+                "src_id": rel.source_id,
+                "tgt_id": rel.target_id,
+                "props": _clean_props(rel.properties),
+                "sources": _source_documents(rel.sources),
+            })
+
+        jobs = []
+        for (rtype, src_type, tgt_type), rows in rows_by_key.items():
+            cypher = _RELATIONSHIP_MERGE.format(
+                src_label=_label(src_type), tgt_label=_label(tgt_type), rel_type=rtype,
+            )
+            jobs.extend((cypher, batch, {}) for batch in _make_batches(rows, BATCH_SIZE))
+        total = self._run_jobs(jobs)
         logger.info("Wrote %d relationships.", total)
         return total
 
+    def _run_jobs(self, jobs: list[tuple[str, list[dict], dict]]) -> int:
+        """
+        Run ``(cypher, rows, params)`` UNWIND batches, each in its own write
+        transaction, across up to ``max_workers`` sessions (the driver is
+        thread-safe; sessions are not).  Returns only once every batch is
+        committed, which is what lets relationship writes MATCH the nodes
+        written before them.  Returns the number of rows written.
+        """
+        def run(job: tuple[str, list[dict], dict]) -> int:
+            cypher, rows, params = job
+            with self.driver.session(database=settings.NEO4J_DATABASE) as session:
+                session.execute_write(_run_batch, cypher, rows, **params)
+            return len(rows)
+
+        if len(jobs) <= 1 or self.max_workers == 1:
+            return sum(map(run, jobs))
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            return sum(pool.map(run, jobs))
+
+    def bump_ingest_epoch(self) -> None:
+        """
+        Record that the graph changed, so long-lived retrievers (see
+        GraphRetriever.graph_epoch) drop their cached results.
+        """
+        with self.driver.session(database=settings.NEO4J_DATABASE) as session:
+            session.run(_BUMP_INGEST_EPOCH)
+
     def create_indexes(self) -> None:
         """Create lookup indexes for common query patterns."""
         index_specs = [
@@ -218,8 +381,11 @@ class Neo4jWriter:
             "CREATE INDEX IF NOT EXISTS FOR (n:Period) ON (n.fiscal_year)",
             "CREATE INDEX IF NOT EXISTS FOR (n:Person) ON (n.name)",
             "CREATE INDEX IF NOT EXISTS FOR (n:Segment) ON (n.name)",
+            # backs GraphRetriever.search_nodes
+            f"CREATE FULLTEXT INDEX {NAME_FULLTEXT_INDEX} IF NOT EXISTS "
+            f"FOR (n:{'|'.join(f'`{t}`' for t in _all_entity_types())}) ON EACH [n.name]",
         ]
-        with self.driver.session() as session:
+        with self.driver.session(database=settings.NEO4J_DATABASE) as session:
             for spec in index_specs:
                 session.run(spec)
         logger.info("Neo4j indexes created.")
@@ -238,6 +404,10 @@ class GraphIngestor:
             gi.ingest("output/extraction/extracted_doc2.json")
             gi.create_indexes()
 
+        # or, resolving everything before a single write pass:
+        with GraphIngestor() as gi:
+            gi.ingest_many(["…/extracted_doc1.json", "…/extracted_doc2.json"])
+
     Entity resolution is cumulative across ``ingest()`` calls, so
     entities from doc2 will be merged with matching entities from doc1.
     """
@@ -248,14 +418,17 @@ class GraphIngestor:
         neo4j_user: str | None = None,
         neo4j_password: str | None = None,
         fuzzy_threshold: int = FUZZY_THRESHOLD,
-        
+        driver: Driver | None = None,
     ) -> None:
         self._uri = neo4j_uri or settings.NEO4J_URI
         self._user = neo4j_user or settings.NEO4J_USER
         self._password = neo4j_password or settings.NEO4J_PASSWORD
 
-        self.driver: Driver = GraphDatabase.driver(
+        # An injected driver is shared with the caller, who closes it
+        self._owns_driver = driver is None
+        self.driver: Driver = driver or GraphDatabase.driver(
             self._uri, auth=(self._user, self._password),
+            max_connection_pool_size=settings.NEO4J_MAX_POOL_SIZE,
         )
         self.writer = Neo4jWriter(self.driver)
         self.resolver = EntityResolver(fuzzy_threshold=fuzzy_threshold)
@@ -271,9 +444,64 @@ class GraphIngestor:
 
         Returns a summary dict with counts.
         """
+        summary, resolved_entities, resolved_rels = self._resolve_document(extraction_json_path)
+        entity_types = self.resolver.entity_types()
+
+        # ── Step 3: write to Neo4j ────────────────────────────────────
+        summary["entities_written"] = self.writer.write_entities(resolved_entities)
+        summary["relationships_written"] = self.writer.write_relationships(
+            resolved_rels, entity_types,
+        )
+        self.writer.bump_ingest_epoch()
+
+        logger.info("Ingestion complete: %s", summary)
+        return summary
+
+    def ingest_many(self, extraction_json_paths: list[str]) -> list[dict]:
+        """
+        Ingest several extraction JSON files with a single write pass.
+
+        Every document is resolved first; the combined registry and all
+        relationships are then written once, instead of re-writing the
+        cumulative registry after each document as repeated ``ingest()``
+        calls do.  Lookup indexes are created up front, so the writes
+        maintain them incrementally.  Returns one summary per document.
+        """
+        self.create_indexes()
+
+        resolved_docs = [self._resolve_document(path) for path in extraction_json_paths]
+        resolved_entities = resolved_docs[-1][1] if resolved_docs else []
+        entity_types = self.resolver.entity_types()
+
+        summaries: list[dict] = []
+        all_rels: list[ResolvedRelationship] = []
+        for summary, _, resolved_rels in resolved_docs:
+            summary["relationships_written"] = len(resolved_rels)
+            all_rels.extend(resolved_rels)
+            summaries.append(summary)
+
+        n_entities = self.writer.write_entities(resolved_entities)
+        n_rels = self.writer.write_relationships(all_rels, entity_types)
+        self.writer.bump_ingest_epoch()
+        for summary in summaries:
+            summary["entities_written"] = n_entities
+
+        logger.info(
+            "Ingested %d document(s): %d entity nodes, %d relationships written",
+            len(summaries), n_entities, n_rels,
+        )
+        return summaries
+
+    def _resolve_document(
+        self, extraction_json_path: str,
+    ) -> tuple[dict, list[ResolvedEntity], list[ResolvedRelationship]]:
+        """
+        Load one extraction file and run it through entity resolution.
+        Returns its partial summary, the resolved entities (the whole
+        registry so far) and its remapped relationships.
+        """
         logger.info("Loading %s …", extraction_json_path)
-        with open(extraction_json_path, "r") as f:
-            data = json.load(f)
+        data = load_json(extraction_json_path)
 
         document_id = data.get("document_id", "unknown")
         raw_entities = data.get("entities", [])
@@ -296,29 +524,23 @@ class GraphIngestor:
         # ── Step 2: remap relationship IDs ────────────────────────────
         resolved_rels = _remap_relationships(raw_relationships, alias_map)
 
-        # ── Step 3: write to Neo4j ────────────────────────────────────
-        n_entities = self.writer.write_entities(resolved_entities)
-        n_rels = self.writer.write_relationships(resolved_rels)
-
         summary = {
             "document_id": document_id,
             "entities_resolved": len(resolved_entities),
             "entities_remapped": remapped,
-            "entities_written": n_entities,
-            "relationships_written": n_rels,
         }
-        logger.info("Ingestion complete: %s", summary)
-        return summary
+        return summary, resolved_entities, resolved_rels
 
     def create_indexes(self) -> None:
-        """Create lookup indexes (call once after all documents are ingested)."""
+        """Create lookup indexes (``ingest_many`` does this itself)."""
         self.writer.create_indexes()
 
     # ── context manager ───────────────────────────────────────────────
 
     def close(self) -> None:
-        self.driver.close()
-        logger.info("Neo4j driver closed.")
+        if self._owns_driver:
+            self.driver.close()
+            logger.info("Neo4j driver closed.")
 
     def __enter__(self):
         return self
@@ -335,6 +557,17 @@ def _all_entity_types() -> list[str]:
     return list(ENTITY_TYPES.keys())
 
 
+def _trigrams(text: str) -> set[str]:
+    """Character trigrams of a name, padded so short names still get some."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _label(entity_type: str | None) -> str:
+    """Cypher label suffix for a node pattern, or "" when the type is unknown."""
+    return f":`{entity_type}`" if entity_type else ""
+
+
 def _remap_relationships(
     raw_rels: list[dict],
     alias_map: dict[str, str],
@@ -373,11 +606,25 @@ def _clean_props(props: dict) -> dict:
             if all(isinstance(i, (str, int, float, bool)) for i in v):
                 clean[k] = v
             else:
-                clean[k] = json.dumps(v)
+                clean[k] = orjson.dumps(v).decode()
         else:
             clean[k] = v
     return clean
 
 
-def _make_batches(items: list, size: int) -> list[list]:
-    return [items[i : i + size] for i in range(0, len(items), size)]
+def _source_documents(sources: list[dict]) -> list[str]:
+    """
+    Document ids to store on a node or edge.  Entries without one are
+    dropped: a null inside a list property would fail the whole batch.
+    """
+    return [s["document_id"] for s in sources if s.get("document_id")]
+
+
+def _run_batch(tx, cypher: str, rows: list[dict], **params) -> None:
+    """Transaction function: run one UNWIND statement over a batch of rows."""
+    tx.run(cypher, rows=rows, **params)
+
+
+def _make_batches(items: list, size: int) -> Iterator[list]:
+    """Yield consecutive ``size``-item slices of ``items``, one at a time."""
+    return (items[i : i + size] for i in range(0, len(items), size))
@@ -6,6 +6,7 @@ Read-only Neo4j queries for the query-time agent.
 Provides three retrieval primitives:
   1. **search_nodes** — fuzzy name search across node labels
   2. **get_neighbors** — N-hop neighborhood expansion from a node
+     (``get_neighbors_batch`` expands several seeds in one query)
   3. **run_cypher** — arbitrary read-only Cypher execution
 
 Plus a helper to convert raw Neo4j records into a compact text
@@ -14,11 +15,17 @@ context string the LLM can reason over.
 
 import json
 import logging
+import re
+import threading
+import time
+from itertools import islice
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable
 
-from neo4j import GraphDatabase, Driver
+from neo4j import GraphDatabase, Driver, RoutingControl
+from neo4j.exceptions import ClientError, DriverError, Neo4jError
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -27,15 +34,79 @@ logger = logging.getLogger(__name__)
 MAX_SEARCH_RESULTS = 20
 MAX_NEIGHBOR_DEPTH = 2
 MAX_CYPHER_ROWS = 50
+MAX_PROPS_CHARS = 400         # per node/relationship line in to_text()
+QUERY_CACHE_SIZE = 512        # memoised retrieval results, shared by forks
+QUERY_CACHE_TTL = 120.0       # seconds a memoised retrieval result is reused
+EPOCH_CHECK_INTERVAL = 10.0   # seconds between reads of the graph's ingest epoch
 # ──────────────────────────────────────────────────────────────────────
 
+# Node whose `epoch` GraphIngestor bumps after every write pass; a change
+# tells long-lived retrievers (in other processes) that results are stale
+INGEST_EPOCH_LABEL = "IngestEpoch"
+_READ_EPOCH = f"MATCH (m:`{INGEST_EPOCH_LABEL}`) RETURN m.epoch AS epoch LIMIT 1"
+
+# Full-text index over every entity label's `name`, created at ingestion
+NAME_FULLTEXT_INDEX = "entity_name_ft"
+
+_FULLTEXT_SEARCH = (
+    "CALL db.index.fulltext.queryNodes($index, $q) YIELD node AS n "
+    "WHERE $type IS NULL OR $type IN labels(n) "
+    "RETURN n LIMIT $lim"
+)
+
+# Substring fallback when the full-text index is unavailable.  The label
+# is a dynamic-label parameter (Neo4j 5.26+), so the scan stays on the
+# label's nodes and one cached plan serves every entity type.
+_SEARCH_WITH_TYPE = (
+    "MATCH (n:$($type)) "
+    "WHERE toLower(n.name) CONTAINS toLower($q) "
+    "RETURN n LIMIT $lim"
+)
+_SEARCH_ANY = (
+    "MATCH (n) "
+    "WHERE n.name IS NOT NULL AND toLower(n.name) CONTAINS toLower($q) "
+    "RETURN n LIMIT $lim"
+)
+
+# Write clauses rejected by run_cypher (word-bounded, so `CREATE(n)` counts)
+_WRITE_CLAUSE = re.compile(r"\b(?:CREATE|MERGE|DELETE|REMOVE|SET|DROP|DETACH)\b", re.IGNORECASE)
+
+# The index analyzer splits names on non-word characters; prefix queries
+# are not analyzed, so the search terms are split the same way up front.
+# Word characters need no Lucene escaping.
+_WORD = re.compile(r"\w+")
+
+
+class _ReadFailed(Exception):
+    """
+    A read failed after a partial (usually empty) result was gathered.
+    Carries that result so the tool can still return it, uncached.
+    """
+
+    def __init__(self, result: Any) -> None:
+        super().__init__()
+        self.result = result
+
 
 @dataclass
 class GraphContext:
     """Accumulated evidence from one or more retrieval calls."""
-    nodes: list[dict] = field(default_factory=list)
-    relationships: list[dict] = field(default_factory=list)
+    nodes: dict[str, dict] = field(default_factory=dict)           # entity_id → node
+    relationships: dict[tuple, dict] = field(default_factory=dict)  # (src, type, tgt) → rel
     raw_rows: list[dict] = field(default_factory=list)   # free-form Cypher results
+    # Bumped on every change, so to_text_cached() knows when to re-render
+    _version: int = field(default=0, repr=False, compare=False)
+    _text_cache: tuple[int, str] | None = field(default=None, repr=False, compare=False)
+
+    def to_text_cached(self) -> str:
+        """``to_text()``, re-rendered only when the evidence has changed."""
+        cached = self._text_cache
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        version = self._version
+        text = self.to_text()
+        self._text_cache = (version, text)
+        return text
 
     def to_text(self) -> str:
         """Render all accumulated evidence as compact text for the LLM."""
@@ -43,38 +114,31 @@ class GraphContext:
 
         if self.nodes:
             parts.append("=== NODES ===")
-            seen_ids: set[str] = set()
-            for n in self.nodes:
+            for n in self.nodes.values():
                 nid = n.get("entity_id", "?")
-                if nid in seen_ids:
-                    continue
-                seen_ids.add(nid)
                 label = n.get("entity_type", n.get("_labels", ""))
                 name = n.get("name", nid)
                 props = {k: v for k, v in n.items()
                          if k not in ("entity_id", "entity_type", "name", "sources", "_labels", "_id")}
                 src = n.get("sources", [])
-                line = f"- [{label}] {name} (id={nid})"
+                buf = [f"- [{label}] {name} (id={nid})"]
                 if props:
-                    line += f"  {props}"
+                    buf.append("  ")
+                    buf.append(_format_props(props))
                 if src:
-                    line += f"  [sources: {', '.join(str(s) for s in src)}]"
-                parts.append(line)
+                    buf.append(f"  [sources: {', '.join(map(str, src))}]")
+                parts.append("".join(buf))
 
         if self.relationships:
             parts.append("\n=== RELATIONSHIPS ===")
-            seen_rels: set[tuple] = set()
-            for r in self.relationships:
-                key = (r.get("src"), r.get("type"), r.get("tgt"))
-                if key in seen_rels:
-                    continue
-                seen_rels.add(key)
+            for r in self.relationships.values():
                 props = {k: v for k, v in r.items()
                          if k not in ("src", "tgt", "type", "sources")}
-                line = f"- ({r.get('src')}) -[{r.get('type')}]-> ({r.get('tgt')})"
+                buf = [f"- ({r.get('src')}) -[{r.get('type')}]-> ({r.get('tgt')})"]
                 if props:
-                    line += f"  {props}"
-                parts.append(line)
+                    buf.append("  ")
+                    buf.append(_format_props(props))
+                parts.append("".join(buf))
 
         if self.raw_rows:
             parts.append("\n=== CYPHER RESULTS ===")
@@ -91,6 +155,9 @@ class GraphRetriever:
     """
     Stateful reader that keeps a Neo4j driver open and accumulates
     a GraphContext across multiple retrieval calls.
+
+    Retrieval methods may be called concurrently from several threads
+    (the driver is thread-safe); context updates are serialised.
     """
 
     def __init__(
@@ -98,14 +165,27 @@ class GraphRetriever:
         neo4j_uri: str | None = None,
         neo4j_user: str | None = None,
         neo4j_password: str | None = None,
+        driver: Driver | None = None,
     ) -> None:
         self._uri = neo4j_uri or settings.NEO4J_URI
         self._user = neo4j_user or settings.NEO4J_USER
         self._password = neo4j_password or settings.NEO4J_PASSWORD
-        self.driver: Driver = GraphDatabase.driver(
+        # One long-lived pooled driver; every read goes through
+        # driver.execute_query so connections are reused across calls.
+        self._owns_driver = driver is None
+        self.driver: Driver = driver or GraphDatabase.driver(
             self._uri, auth=(self._user, self._password),
+            max_connection_pool_size=settings.NEO4J_MAX_POOL_SIZE,
         )
         self.context = GraphContext()
+        self._context_lock = threading.Lock()
+        # Server capabilities found at runtime; shared with fork()ed
+        # retrievers so a missing index is only discovered once.
+        self._capabilities: dict[str, bool] = {}
+        # Retrieval results by normalised arguments, also shared with forks,
+        # and the ingest epoch they were fetched under
+        self._query_cache = TTLCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL)
+        self._epoch_state: dict[str, Any] = {"epoch": None, "checked_at": float("-inf")}
 
     # ── Tool 1: search_nodes ──────────────────────────────────────────
 
@@ -116,27 +196,73 @@ class GraphRetriever:
         limit: int = MAX_SEARCH_RESULTS,
     ) -> list[dict]:
         """
-        Case-insensitive substring search on node `name` property.
+        Case-insensitive search on node `name` property.
         Optionally filter by entity type label.
         Returns list of node property dicts and appends to context.
         """
-        if entity_type:
-            cypher: str = (
-                f"MATCH (n:`{entity_type}`) "
-                "WHERE toLower(n.name) CONTAINS toLower($q) "
-                "RETURN n LIMIT $lim"
-            )
-        else:
-            cypher = (
-                "MATCH (n) "
-                "WHERE n.name IS NOT NULL AND toLower(n.name) CONTAINS toLower($q) "
-                "RETURN n LIMIT $lim"
-            )
+        key = ("search_nodes", entity_type, query.lower(), limit)
+        return self._memoised(
+            key,
+            lambda: self._search_nodes(query, entity_type, limit),
+            lambda nodes: self._accumulate_nodes(nodes),
+        )
+
+    def _search_nodes(self, query: str, entity_type: str | None, limit: int) -> list[dict]:
+        """
+        Uncached search_nodes.
 
-        nodes = self._run_and_collect_nodes(cypher, {"q": query, "lim": limit})
+        Goes through the ``entity_name_ft`` full-text index (each query
+        word as a prefix, best matches first).  Falls back to a substring
+        scan when the index does not exist, rejects the query, or finds
+        nothing: prefix terms miss in-word matches ("bank" in "Citibank")
+        and names lacking one of the words.
+        """
+        if self._capabilities.get("fulltext", True):
+            nodes = self._search_fulltext(query, entity_type, limit)
+            if nodes:
+                logger.info("search_nodes(%r, type=%s) → %d nodes", query, entity_type, len(nodes))
+                return nodes
+
+        cypher = _SEARCH_WITH_TYPE if entity_type else _SEARCH_ANY
+        nodes = self._run_and_collect_nodes(
+            cypher, {"q": query, "type": entity_type, "lim": limit},
+        )
         logger.info("search_nodes(%r, type=%s) → %d nodes", query, entity_type, len(nodes))
         return nodes
 
+    def _search_fulltext(self, query: str, entity_type: str | None, limit: int) -> list[dict] | None:
+        """Index-backed search_nodes; None (or no hits) means use the CONTAINS scan instead."""
+        terms = [word + "*" for word in _WORD.findall(query.lower())]
+        if not terms:
+            return None
+        params = {
+            "index": NAME_FULLTEXT_INDEX,
+            "q": " AND ".join(terms),
+            "type": entity_type,
+            "lim": limit,
+        }
+        try:
+            records = self._read(_FULLTEXT_SEARCH, params)
+        except ClientError as exc:
+            if "no such fulltext" in str(exc).lower():
+                logger.warning(
+                    "Full-text index %s not found; search_nodes will scan labels instead",
+                    NAME_FULLTEXT_INDEX,
+                )
+                self._capabilities["fulltext"] = False
+            else:
+                logger.warning("Full-text search failed for %r: %s", query, exc)
+            return None
+        except (Neo4jError, DriverError) as exc:
+            # Transient or connection-level (ServiceUnavailable,
+            # SessionExpired, ...): the CONTAINS scan gets its own attempt
+            logger.warning("Full-text search failed for %r: %s", query, exc)
+            return None
+
+        nodes = [_node_to_dict(record["n"]) for record in records]
+        self._accumulate_nodes(nodes)
+        return nodes
+
     # ── Tool 2: get_neighbors ─────────────────────────────────────────
 
     def get_neighbors(
@@ -151,6 +277,16 @@ class GraphRetriever:
         Returns {"nodes": [...], "relationships": [...]}.
         """
         depth = min(depth, MAX_NEIGHBOR_DEPTH)
+        return self._memoised(
+            ("get_neighbors", entity_id, depth, rel_type),
+            lambda: self._get_neighbors(entity_id, depth, rel_type),
+            lambda result: self.remember(
+                nodes=result["nodes"], relationships=result["relationships"],
+            ),
+        )
+
+    def _get_neighbors(self, entity_id: str, depth: int, rel_type: str | None) -> dict:
+        """Uncached get_neighbors; ``depth`` is already clamped."""
 
         rel_pattern = f":`{rel_type}`" if rel_type else ""
         cypher = (
@@ -160,30 +296,28 @@ class GraphRetriever:
             f"  RETURN r, neighbor "
             f"}} "
             "RETURN start, r, neighbor "
-            f"LIMIT {MAX_CYPHER_ROWS}"
+            "LIMIT $lim"
         )
 
         nodes: list[dict] = []
         rels: list[dict] = []
         try:
-            with self.driver.session() as session:
-                result = session.run(cypher, {"eid": entity_id})
-                for record in result:
-                    # start node
-                    start_node = record["start"]
-                    nodes.append(_node_to_dict(start_node))
-
-                    # neighbor node
-                    neighbor = record["neighbor"]
-                    nodes.append(_node_to_dict(neighbor))
-
-                    # relationships (can be a path/list)
-                    raw_rels = record["r"]
-                    if isinstance(raw_rels, list):
-                        for rel in raw_rels:
-                            rels.append(_rel_to_dict(rel))
-                    else:
-                        rels.append(_rel_to_dict(raw_rels))
+            for record in self._read(cypher, {"eid": entity_id, "lim": MAX_CYPHER_ROWS}):
+                # start node
+                start_node = record["start"]
+                nodes.append(_node_to_dict(start_node))
+
+                # neighbor node
+                neighbor = record["neighbor"]
+                nodes.append(_node_to_dict(neighbor))
+
+                # relationships (can be a path/list)
+                raw_rels = record["r"]
+                if isinstance(raw_rels, list):
+                    for rel in raw_rels:
+                        rels.append(_rel_to_dict(rel))
+                else:
+                    rels.append(_rel_to_dict(raw_rels))
         except Exception as exc:
             logger.error("get_neighbors failed for %s: %s", entity_id, exc)
             # Fallback to simpler query without CALL subquery
@@ -199,6 +333,87 @@ class GraphRetriever:
         )
         return {"nodes": nodes, "relationships": rels}
 
+    def get_neighbors_batch(
+        self,
+        entity_ids: list[str],
+        depth: int = 1,
+        rel_type: str | None = None,
+    ) -> dict[str, dict]:
+        """
+        ``get_neighbors`` for several seed nodes in one round trip.
+        Returns ``{entity_id: {"nodes": [...], "relationships": [...]}}``.
+        Per-seed results share the get_neighbors cache, so seeds fetched
+        earlier (either way) are not queried again.
+        """
+        depth = min(depth, MAX_NEIGHBOR_DEPTH)
+        seeds = list(dict.fromkeys(entity_ids))
+        self.graph_epoch()
+
+        results: dict[str, dict] = {}
+        missing: list[str] = []
+        for eid in seeds:
+            cached = self._query_cache.get(("get_neighbors", eid, depth, rel_type))
+            if cached is None:
+                missing.append(eid)
+            else:
+                self.remember(nodes=cached["nodes"], relationships=cached["relationships"])
+                results[eid] = cached
+
+        if missing:
+            results.update(self._get_neighbors_batch(missing, depth, rel_type))
+
+        return {eid: results[eid] for eid in seeds}
+
+    def _get_neighbors_batch(
+        self, entity_ids: list[str], depth: int, rel_type: str | None,
+    ) -> dict[str, dict]:
+        """
+        get_neighbors_batch for seeds not in the cache; caches what it
+        fetches.  Falls back to (memoised) get_neighbors per seed.
+        """
+        if len(entity_ids) == 1:
+            return {entity_ids[0]: self.get_neighbors(entity_ids[0], depth, rel_type)}
+
+        rel_pattern = f":`{rel_type}`" if rel_type else ""
+        cypher = (
+            "UNWIND $ids AS eid "
+            "MATCH (start {entity_id: eid}) "
+            f"CALL (start) {{ "
+            f"  MATCH (start)-[r{rel_pattern}*1..{depth}]-(neighbor) "
+            f"  RETURN r, neighbor LIMIT $lim "
+            f"}} "
+            "RETURN eid, start, r, neighbor"
+        )
+
+        results = {eid: {"nodes": [], "relationships": []} for eid in entity_ids}
+        try:
+            records = self._read(cypher, {"ids": entity_ids, "lim": MAX_CYPHER_ROWS})
+        except Exception as exc:
+            logger.error("get_neighbors_batch failed for %s: %s", entity_ids, exc)
+            return {eid: self.get_neighbors(eid, depth, rel_type) for eid in entity_ids}
+
+        for record in records:
+            result = results[record["eid"]]
+            result["nodes"].append(_node_to_dict(record["start"]))
+            result["nodes"].append(_node_to_dict(record["neighbor"]))
+            raw_rels = record["r"]
+            if isinstance(raw_rels, list):
+                result["relationships"].extend(_rel_to_dict(rel) for rel in raw_rels)
+            else:
+                result["relationships"].append(_rel_to_dict(raw_rels))
+
+        for eid, result in results.items():
+            self._accumulate_nodes(result["nodes"])
+            self._accumulate_rels(result["relationships"])
+            if _cacheable(result):
+                self._query_cache.set(("get_neighbors", eid, depth, rel_type), result)
+
+        logger.info(
+            "get_neighbors_batch(%d seeds, depth=%d) → %d rows",
+            len(entity_ids), depth, len(records),
+        )
+        return results
+
     def _get_neighbors_simple(
         self,
         entity_id: str,
@@ -211,25 +426,26 @@ class GraphRetriever:
 
         cypher = (
             f"MATCH (start {{entity_id: $eid}})-[r{rel_pattern}*1..{depth}]-(neighbor) "
-            f"RETURN start, r, neighbor LIMIT {MAX_CYPHER_ROWS}"
+            "RETURN start, r, neighbor LIMIT $lim"
         )
 
         nodes: list[dict] = []
         rels: list[dict] = []
         try:
-            with self.driver.session() as session:
-                result = session.run(cypher, {"eid": entity_id})
-                for record in result:
-                    nodes.append(_node_to_dict(record["start"]))
-                    nodes.append(_node_to_dict(record["neighbor"]))
-                    raw_rels = record["r"]
-                    if isinstance(raw_rels, list):
-                        for rel in raw_rels:
-                            rels.append(_rel_to_dict(rel))
-                    else:
-                        rels.append(_rel_to_dict(raw_rels))
+            for record in self._read(cypher, {"eid": entity_id, "lim": MAX_CYPHER_ROWS}):
+                nodes.append(_node_to_dict(record["start"]))
+                nodes.append(_node_to_dict(record["neighbor"]))
+                raw_rels = record["r"]
+                if isinstance(raw_rels, list):
+                    for rel in raw_rels:
+                        rels.append(_rel_to_dict(rel))
+                else:
+                    rels.append(_rel_to_dict(raw_rels))
         except Exception as exc:
             logger.error("get_neighbors_simple also failed for %s: %s", entity_id, exc)
+            self._accumulate_nodes(nodes)
+            self._accumulate_rels(rels)
+            raise _ReadFailed({"nodes": nodes, "relationships": rels}) from exc
 
         self._accumulate_nodes(nodes)
         self._accumulate_rels(rels)
@@ -243,31 +459,38 @@ class GraphRetriever:
         Returns list of row dicts and appends to context.
         """
         params = params or {}
+        key = (
+            "run_cypher",
+            " ".join(cypher.split()),
+            json.dumps(params, sort_keys=True, default=str),
+        )
+        return self._memoised(
+            key,
+            lambda: self._run_cypher(cypher, params),
+            lambda rows: self._accumulate_rows(rows),
+        )
+
+    def _run_cypher(self, cypher: str, params: dict) -> list[dict]:
+        """Uncached run_cypher."""
 
         # Safety: block write operations
-        upper = cypher.strip().upper()
-        for keyword in ("CREATE", "MERGE", "DELETE", "REMOVE", "SET", "DROP", "DETACH"):
-            if keyword in upper.split():
-                logger.warning("Blocked write Cypher: %s", cypher[:100])
-                return [{"error": "Write operations are not allowed."}]
+        if _WRITE_CLAUSE.search(cypher):
+            logger.warning("Blocked write Cypher: %s", cypher[:100])
+            return [{"error": "Write operations are not allowed."}]
 
         rows: list[dict] = []
         try:
-            with self.driver.session() as session:
-                result = session.run(cypher, params)
-                for record in result:
-                    row: dict = {}
-                    for key in record.keys():
-                        val = record[key]
-                        row[key] = _neo4j_value_to_serialisable(val)
-                    rows.append(row)
-                    if len(rows) >= MAX_CYPHER_ROWS:
-                        break
+            for record in self._read(cypher, params, max_records=MAX_CYPHER_ROWS):
+                row: dict = {}
+                for key in record.keys():
+                    val = record[key]
+                    row[key] = _neo4j_value_to_serialisable(val)
+                rows.append(row)
         except Exception as exc:
             logger.error("Cypher execution failed: %s\n  Query: %s", exc, cypher[:200])
             rows = [{"error": str(exc)}]
 
-        self.context.raw_rows.extend(rows)
+        self._accumulate_rows(rows)
         logger.info("run_cypher → %d rows", len(rows))
         return rows
 
@@ -277,33 +500,79 @@ class GraphRetriever:
         """Return a compact summary of what's actually in the graph."""
         rows = []
         try:
-            with self.driver.session() as session:
-                # Node label counts
-                result = session.run(
-                    "MATCH (n) RETURN labels(n)[0] AS label, count(n) AS cnt ORDER BY cnt DESC"
-                )
-                rows.append("Node counts:")
-                for rec in result:
-                    rows.append(f"  {rec['label']}: {rec['cnt']}")
-
-                # Relationship type counts
-                result = session.run(
-                    "MATCH ()-[r]->() RETURN type(r) AS rtype, count(r) AS cnt ORDER BY cnt DESC"
-                )
-                rows.append("Relationship counts:")
-                for rec in result:
-                    rows.append(f"  {rec['rtype']}: {rec['cnt']}")
+            with self.driver.session(database=settings.NEO4J_DATABASE) as session:
+                label_counts, rel_counts = session.execute_read(_read_schema_counts)
+            rows.append("Node counts:")
+            for label, cnt in label_counts:
+                rows.append(f"  {label}: {cnt}")
+            rows.append("Relationship counts:")
+            for rtype, cnt in rel_counts:
+                rows.append(f"  {rtype}: {cnt}")
         except Exception as exc:
             rows.append(f"(schema query failed: {exc})")
 
         return "\n".join(rows)
 
+    def remember(
+        self,
+        nodes: list[dict] | None = None,
+        relationships: list[dict] | None = None,
+        rows: list[dict] | None = None,
+    ) -> None:
+        """Add previously retrieved results to the current context."""
+        if nodes:
+            self._accumulate_nodes(nodes)
+        if relationships:
+            self._accumulate_rels(relationships)
+        if rows:
+            self._accumulate_rows(rows)
+
+    def fork(self) -> "GraphRetriever":
+        """
+        A retriever sharing this one's driver and result cache, with its
+        own empty context.
+        """
+        child = GraphRetriever(driver=self.driver)
+        child._capabilities = self._capabilities
+        child._query_cache = self._query_cache
+        child._epoch_state = self._epoch_state
+        return child
+
+    def graph_epoch(self) -> Any:
+        """
+        The graph's ingest epoch, re-read at most every
+        ``EPOCH_CHECK_INTERVAL`` seconds.  When it has moved on since the
+        last read, memoised results are dropped.
+        """
+        state = self._epoch_state
+        now = time.monotonic()
+        if now - state["checked_at"] < EPOCH_CHECK_INTERVAL:
+            return state["epoch"]
+        state["checked_at"] = now
+        try:
+            records = self._read(_READ_EPOCH, {})
+        except Exception as exc:
+            logger.warning("Could not read the ingest epoch: %s", exc)
+            return state["epoch"]
+        epoch = records[0]["epoch"] if records else None
+        if epoch != state["epoch"]:
+            if state["epoch"] is not None:
+                logger.info("Graph re-ingested; dropping cached retrieval results")
+            self._query_cache.clear()
+            state["epoch"] = epoch
+        return epoch
+
+    def invalidate_cache(self) -> None:
+        """Drop memoised results (call after ingesting new data)."""
+        self._query_cache.clear()
+
     def reset_context(self) -> None:
         """Clear accumulated context for a new query."""
         self.context = GraphContext()
 
     def close(self) -> None:
-        self.driver.close()
+        if self._owns_driver:
+            self.driver.close()
 
     def __enter__(self):
         return self
@@ -313,33 +582,122 @@ class GraphRetriever:
 
     # ── Private helpers ───────────────────────────────────────────────
 
+    def _memoised(self, key: tuple, fetch: Callable[[], Any], replay: Callable[[Any], None]) -> Any:
+        """
+        Return the cached result for ``key``, or ``fetch()`` it and cache
+        it.  A hit is ``replay``ed into this retriever's context, which the
+        original fetch accumulated into a different context.  Results
+        carrying an error row, empty results, and results of a fetch whose
+        read failed are not cached.
+        """
+        self.graph_epoch()
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            logger.info("%s cache hit", key[0])
+            replay(cached)
+            return cached
+
+        try:
+            result = fetch()
+        except _ReadFailed as exc:
+            return exc.result
+        if _cacheable(result):
+            self._query_cache.set(key, result)
+        return result
+
+    def _read(self, cypher: str, params: dict, max_records: int | None = None) -> list:
+        """
+        Run a read query on a pooled connection and return its records.
+        With ``max_records``, only that many are pulled off the result
+        stream; the rest are never fetched.
+        """
+        if max_records is None:
+            records, _, _ = self.driver.execute_query(
+                cypher, parameters_=params,
+                database_=settings.NEO4J_DATABASE,
+                routing_=RoutingControl.READ,
+            )
+            return records
+        return self.driver.execute_query(
+            cypher, parameters_=params,
+            database_=settings.NEO4J_DATABASE,
+            routing_=RoutingControl.READ,
+            result_transformer_=lambda result: list(islice(result, max_records)),
+        )
+
     def _run_and_collect_nodes(self, cypher: str, params: dict) -> list[dict]:
         nodes: list[dict] = []
         try:
-            with self.driver.session() as session:
-                result = session.run(cypher, params)
-                for record in result:
-                    node = record["n"]
-                    nodes.append(_node_to_dict(node))
+            for record in self._read(cypher, params, max_records=params.get("lim", MAX_SEARCH_RESULTS)):
+                node = record["n"]
+                nodes.append(_node_to_dict(node))
         except Exception as exc:
             logger.error("Node query failed: %s", exc)
+            self._accumulate_nodes(nodes)
+            raise _ReadFailed(nodes) from exc
         self._accumulate_nodes(nodes)
         return nodes
 
     def _accumulate_nodes(self, nodes: list[dict]) -> None:
-        seen = {n.get("entity_id") for n in self.context.nodes}
-        for n in nodes:
-            if n.get("entity_id") not in seen:
-                self.context.nodes.append(n)
-                seen.add(n.get("entity_id"))
+        with self._context_lock:
+            known = self.context.nodes
+            for n in nodes:
+                eid = n.get("entity_id")
+                if eid not in known:
+                    known[eid] = n
+                    self.context._version += 1
 
     def _accumulate_rels(self, rels: list[dict]) -> None:
-        seen = {(r.get("src"), r.get("type"), r.get("tgt")) for r in self.context.relationships}
-        for r in rels:
-            key = (r.get("src"), r.get("type"), r.get("tgt"))
-            if key not in seen:
-                self.context.relationships.append(r)
-                seen.add(key)
+        with self._context_lock:
+            known = self.context.relationships
+            for r in rels:
+                key = (r.get("src"), r.get("type"), r.get("tgt"))
+                if key not in known:
+                    known[key] = r
+                    self.context._version += 1
+
+    def _accumulate_rows(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        with self._context_lock:
+            self.context.raw_rows.extend(rows)
+            self.context._version += 1
+
+
+def _cacheable(result: Any) -> bool:
+    """
+    Whether a retrieval result may be memoised: not empty (the data may
+    simply not be ingested yet) and carrying no error row.
+    """
+    if isinstance(result, dict):
+        return bool(result.get("nodes"))
+    return bool(result) and not any("error" in row for row in result)
+
+
+def _read_schema_counts(tx) -> tuple[list[tuple], list[tuple]]:
+    """
+    Transaction function: label and relationship-type counts.  Both
+    statements are sent before either result is read, so the driver can
+    pipeline them over one connection.
+    """
+    labels = tx.run(
+        f"MATCH (n) WHERE NOT n:`{INGEST_EPOCH_LABEL}` "
+        "RETURN labels(n)[0] AS label, count(n) AS cnt ORDER BY cnt DESC"
+    )
+    rels = tx.run(
+        "MATCH ()-[r]->() RETURN type(r) AS rtype, count(r) AS cnt ORDER BY cnt DESC"
+    )
+    label_counts = [(rec["label"], rec["cnt"]) for rec in labels]
+    rel_counts = [(rec["rtype"], rec["cnt"]) for rec in rels]
+    return label_counts, rel_counts
+
+
+def _format_props(props: dict) -> str:
+    """Render properties as ``k=v`` pairs, cut off at MAX_PROPS_CHARS."""
+    text = " ".join(f"{k}={v}" for k, v in props.items())
+    if len(text) > MAX_PROPS_CHARS:
+        return text[:MAX_PROPS_CHARS] + "…"
+    return text
 
 
 # ── Neo4j value conversions ──────────────────────────────────────────
@@ -357,9 +715,9 @@ def _rel_to_dict(rel) -> dict:
     d = dict(rel)
     d["type"] = rel.type if hasattr(rel, "type") else "UNKNOWN"
     if hasattr(rel, "start_node"):
-        d["src"] = dict(rel.start_node).get("entity_id", "?")
+        d["src"] = rel.start_node.get("entity_id", "?")
     if hasattr(rel, "end_node"):
-        d["tgt"] = dict(rel.end_node).get("entity_id", "?")
+        d["tgt"] = rel.end_node.get("entity_id", "?")
     return d
 
 
@@ -1,10 +1,54 @@
+import pymupdf
 import pymupdf.layout
 import pymupdf4llm
 import logging
-from typing import List, Dict
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List
 
 logger = logging.getLogger(__name__)
 
+# Conversion strategy by document size: (up to this many pages, pages
+# per worker task).  A batch size of 0 converts in-process: spawning
+# workers costs more than it saves on a handful of pages.  Filing pages
+# vary a lot in cost (dense tables vs. prose), so mid-sized documents use
+# small batches to keep every worker busy until the end; very long ones
+# use larger batches to cut per-task overhead.
+PAGE_COUNT_TIERS: tuple[tuple[int | None, int], ...] = (
+    (3, 0),
+    (200, 8),
+    (1000, 16),
+    (None, 32),
+)
+
+
+def _pages_per_batch(page_count: int) -> int:
+    for max_pages, batch_size in PAGE_COUNT_TIERS:
+        if max_pages is None or page_count <= max_pages:
+            return batch_size
+    return PAGE_COUNT_TIERS[-1][1]
+
+
+# The document opened by each page-conversion worker process
+_worker_doc: "pymupdf.Document | None" = None
+
+
+def _open_worker_doc(pdf_path: str) -> None:
+    """Worker initializer: open the PDF once for every batch this worker runs."""
+    global _worker_doc
+    _worker_doc = pymupdf.open(pdf_path)
+
+
+def _to_page_chunks(pages: List[int]) -> List[Dict]:
+    """Convert a batch of pages to markdown chunks (runs in a worker process)."""
+    return pymupdf4llm.to_markdown(_worker_doc, pages=pages, page_chunks=True)
+
+
+def _page_batches(page_count: int, workers: int) -> List[List[int]]:
+    """Split ``range(page_count)`` into contiguous batches sized by PAGE_COUNT_TIERS."""
+    size = min(_pages_per_batch(page_count), -(-page_count // workers))
+    return [list(range(i, min(i + size, page_count))) for i in range(0, page_count, size)]
+
 
 class PDFParser:
     """
@@ -14,79 +58,97 @@ class PDFParser:
     Returns structured data with pages and blocks.
     """
     
-    def __init__(self, pdf_path: str, document_id: str, document_name: str, document_type: str = None) -> None:
+    def __init__(self, pdf_path: str, document_id: str, document_name: str, document_type: str = None,
+                 max_workers: int | None = None) -> None:
         self.pdf_path = pdf_path
         self.document_id = document_id
         self.document_name = document_name
         self.document_type = document_type
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.processed_page_chunks = []
     
     def process_page_chunk(self, page_chunk: Dict) -> Dict:
         """Process a single page chunk and extract blocks"""
-        page_blocks = page_chunk["page_boxes"]
-        page = {"page_number": None, "blocks": []}
-
-        page_number = page_chunk["metadata"]["page_number"]
-        page["page_number"] = page_number
-
-        for page_block in page_blocks:
-            block = {}
-            
-            block_content_start = page_block["pos"][0]
-            block_content_end = page_block["pos"][1]
-
-            block_type = page_block["class"]
-            block_order = page_block["index"]
-            
-            block_content = page_chunk["text"][block_content_start:block_content_end]
+        # Every block is a slice of the page-wide markdown, so the text is
+        # read once and each box just indexes into it.
+        text = page_chunk["text"]
 
-            block.update({
-                "block_type": block_type,
-                "block_order": block_order,
-                "content": block_content
-            })
-
-            page["blocks"].append(block)
-
-        return page
+        return {
+            "page_number": page_chunk["metadata"]["page_number"],
+            "blocks": [
+                {
+                    "block_type": page_block["class"],
+                    "block_order": page_block["index"],
+                    "content": text[page_block["pos"][0]:page_block["pos"][1]],
+                }
+                for page_block in page_chunk["page_boxes"]
+            ],
+        }
 
     def process_document(self) -> Dict:
         """Process entire document and return LLM-optimized markdown"""
         
         logger.info(f"Processing document: {self.document_name}")
         
-        # Extract page chunks with metadata
-        page_chunks = pymupdf4llm.to_markdown(self.pdf_path, page_chunks=True)
-        
-        logger.info(f"Total pages: {page_chunks[0]['metadata']['page_count']}")
-        
-        # Extract document metadata from first page chunk
-        document_metadata = {
-            "name": self.document_name,
-            "id": self.document_id,
-            "metadata": {
-                "page_count": page_chunks[0]["metadata"]["page_count"],
-                "format": page_chunks[0]["metadata"].get("format", ""),
-                "file_path": self.pdf_path
-            }
-        }
+        # Document metadata, then every page
+        processed_document = self.document_header()
+        logger.info(f"Total pages: {processed_document['metadata']['page_count']}")
 
-        # Process each page chunk
-        for idx, page_chunk in enumerate(page_chunks):
-            logger.debug(f"Processing page {idx + 1}/{len(page_chunks)}")
-            processed_page_chunk = self.process_page_chunk(page_chunk)
+        for idx, processed_page_chunk in enumerate(self.process_document_stream()):
+            logger.debug(f"Processing page {idx + 1}")
             self.processed_page_chunks.append(processed_page_chunk)
         
-        logger.info(f"Document processing complete! Processed {len(page_chunks)} pages")
-        
-        # Build final document structure
-        processed_document = {
-            **document_metadata,
-            "pages": self.processed_page_chunks
-        }
+        logger.info(f"Document processing complete! Processed {len(self.processed_page_chunks)} pages")
         
+        processed_document["pages"] = self.processed_page_chunks
         return processed_document
+
+    def document_header(self) -> Dict:
+        """The document's fields other than ``pages``."""
+        with pymupdf.open(self.pdf_path) as doc:
+            return {
+                "name": self.document_name,
+                "id": self.document_id,
+                "metadata": {
+                    "page_count": doc.page_count,
+                    "format": (doc.metadata or {}).get("format", ""),
+                    "file_path": self.pdf_path
+                }
+            }
+
+    def process_document_stream(self) -> Iterator[Dict]:
+        """
+        Yield processed pages in page order as their batches are converted,
+        without keeping them.  Together with ``document_header`` this is
+        ``process_document`` for callers that write pages out as they go.
+        """
+        for page_chunk in self._iter_page_chunks():
+            yield self.process_page_chunk(page_chunk)
     
+    def _iter_page_chunks(self) -> Iterator[Dict]:
+        """
+        Run pymupdf4llm over the document, fanning contiguous page batches
+        out to a process pool when PAGE_COUNT_TIERS calls for it.  Pages
+        are independent, so batches are yielded in order as they arrive.
+        """
+        with pymupdf.open(self.pdf_path) as doc:
+            page_count = doc.page_count
+            workers = min(self.max_workers, page_count)
+            if _pages_per_batch(page_count) == 0 or workers < 2:
+                # Reuse the open document rather than re-parsing the file
+                yield from pymupdf4llm.to_markdown(doc, page_chunks=True)
+                return
+
+        batches = _page_batches(page_count, workers)
+        logger.debug(f"Converting {page_count} pages in {len(batches)} batches")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_open_worker_doc,
+            initargs=(self.pdf_path,),
+        ) as pool:
+            for batch in pool.map(_to_page_chunks, batches):
+                yield from batch
+
     def __enter__(self):
         return self
     
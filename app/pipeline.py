@@ -14,18 +14,32 @@ Usage (as a module)::
 
 Each stage writes its output to ``output/parsing/`` and
 ``output/extraction/`` so individual stages can be re-run or inspected.
+
+Filings are parsed and extracted in parallel worker processes
+(``INGEST_N_THREADS``, default one per CPU); ingestion into Neo4j then
+runs once, serially, in the parent process.
 """
 
+import hashlib
 import json
 import logging
 import os
 import re
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from functools import cached_property
+from itertools import islice
 from pathlib import Path
+from typing import Callable, Iterator
+
+import orjson
+from neo4j import Driver
 
 from app.core.config import settings
+from app.core.jsonio import dump_json_stream
 from app.graphrag.pdf_parsing import PDFParser
-from app.graphrag.entity_relation_extraction import EntityRelationExtractor
+from app.graphrag.entity_relation_extraction import EntityRelationExtractor, RATE_LIMIT_CALLS
 from app.graphrag.graph_ingestion import GraphIngestor
 
 logger = logging.getLogger(__name__)
@@ -35,6 +49,14 @@ FILINGS_DIR = os.path.join(settings.PDF_INPUT_DIR, "filings")
 PARSING_OUTPUT_DIR = os.path.join(settings.PDF_OUTPUT_DIR, "parsing")
 EXTRACTION_OUTPUT_DIR = os.path.join(settings.PDF_OUTPUT_DIR, "extraction")
 
+# Stage outputs written in the background while the next filing is processed
+MAX_PENDING_WRITES = 2
+# Filings parsed ahead of the one being extracted (single-worker runs; >= 1)
+PARSE_AHEAD = 1
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_YEAR_RE = re.compile(r"^\d{4}$")
+
 
 @dataclass
 class FilingInfo:
@@ -46,15 +68,17 @@ class FilingInfo:
     document_id: str         # e.g. "infosys_form20f_2025"
     document_name: str       # e.g. "form20f-2025.pdf"
 
-    @property
+    @cached_property
+    def file_slug(self) -> str:
+        return _slugify(Path(self.file_name).stem)
+
+    @cached_property
     def parsed_json_path(self) -> str:
-        base = _slugify(Path(self.file_name).stem)
-        return os.path.join(PARSING_OUTPUT_DIR, f"parsed_{self.company_name}_{base}.json")
+        return os.path.join(PARSING_OUTPUT_DIR, f"parsed_{self.company_name}_{self.file_slug}.json")
 
-    @property
+    @cached_property
     def extracted_json_path(self) -> str:
-        base = _slugify(Path(self.file_name).stem)
-        return os.path.join(EXTRACTION_OUTPUT_DIR, f"extracted_{self.company_name}_{base}.json")
+        return os.path.join(EXTRACTION_OUTPUT_DIR, f"extracted_{self.company_name}_{self.file_slug}.json")
 
 
 def discover_filings(company_filter: str | None = None) -> list[FilingInfo]:
@@ -71,37 +95,32 @@ def discover_filings(company_filter: str | None = None) -> list[FilingInfo]:
         logger.warning("Filings directory not found: %s", FILINGS_DIR)
         return filings
 
-    for company_dir in sorted(os.listdir(FILINGS_DIR)):
-        company_path = os.path.join(FILINGS_DIR, company_dir)
-        if not os.path.isdir(company_path):
-            continue
-
-        company_name = company_dir.lower().strip()
+    for company_entry in _sorted_dirs(FILINGS_DIR):
+        company_name = company_entry.name.lower().strip()
 
         if company_filter and company_name != company_filter.lower().strip():
             continue
 
-        for year_dir in sorted(os.listdir(company_path)):
-            year_path = os.path.join(company_path, year_dir)
-            if not os.path.isdir(year_path):
-                continue
-
+        for year_entry in _sorted_dirs(company_entry.path):
             # Validate year
-            year = year_dir.strip()
-            if not re.match(r"^\d{4}$", year):
-                logger.warning("Skipping non-year directory: %s", year_path)
+            year = year_entry.name.strip()
+            if not _YEAR_RE.match(year):
+                logger.warning("Skipping non-year directory: %s", year_entry.path)
                 continue
 
-            for file_name in sorted(os.listdir(year_path)):
-                if not file_name.lower().endswith(".pdf"):
-                    continue
+            with os.scandir(year_entry.path) as it:
+                pdf_entries = sorted(
+                    (e for e in it if e.name.lower().endswith(".pdf") and e.is_file()),
+                    key=lambda e: e.name,
+                )
 
-                pdf_path = os.path.join(year_path, file_name)
+            for pdf_entry in pdf_entries:
+                file_name = pdf_entry.name
                 base_slug = _slugify(Path(file_name).stem)
                 document_id = f"{company_name}_{base_slug}"
 
                 filings.append(FilingInfo(
-                    pdf_path=pdf_path,
+                    pdf_path=pdf_entry.path,
                     company_name=company_name,
                     year=year,
                     file_name=file_name,
@@ -123,20 +142,52 @@ class Pipeline:
         results = pipeline.run("infosys") # one company
     """
 
-    def __init__(self, skip_existing: bool = True) -> None:
+    def __init__(
+        self,
+        skip_existing: bool = True,
+        max_workers: int | None = None,
+        parser_workers: int | None = None,
+        neo4j_driver: Driver | None = None,
+        llm_rate_limit: int = RATE_LIMIT_CALLS,
+    ) -> None:
         """
         Args:
-            skip_existing: If True, skip stages whose output files already
-                           exist.  Set False to force re-processing.
+            skip_existing:  If True, skip stages whose output files already
+                            exist.  Set False to force re-processing.
+            max_workers:    Filings to parse + extract concurrently.
+                            Defaults to ``INGEST_N_THREADS`` or the CPU count.
+            parser_workers: Page-conversion processes per PDF (see
+                            PDFParser); defaults to the CPU count.
+            neo4j_driver:   Driver to ingest with, left open for the caller
+                            to reuse and close.  By default each run opens
+                            and closes its own.
+            llm_rate_limit: Extraction LLM calls per ``RATE_LIMIT_WINDOW``
+                            for the whole run; split evenly between worker
+                            processes.
         """
         self.skip_existing = skip_existing
-
-    def run(self, company_filter: str | None = None) -> list[dict]:
+        self.max_workers = max_workers or settings.INGEST_N_THREADS or os.cpu_count() or 1
+        self.parser_workers = parser_workers
+        self.neo4j_driver = neo4j_driver
+        self.llm_rate_limit = llm_rate_limit
+
+    def run(
+        self,
+        company_filter: str | None = None,
+        on_filing_done: Callable[[dict], None] | None = None,
+    ) -> list[dict]:
         """
         Run the full pipeline for all (or filtered) filings.
 
+        Args:
+            company_filter: Only process this company.
+            on_filing_done: Called with each filing's summary as soon as
+                            its parse + extract stages finish (in completion
+                            order, before ingestion).
+
         Returns a list of summary dicts, one per filing.
         """
+        notify = on_filing_done or (lambda summary: None)
         filings = discover_filings(company_filter)
 
         if not filings:
@@ -148,46 +199,71 @@ class Pipeline:
             logger.info("  %s  (company=%s, year=%s, id=%s)",
                         f.pdf_path, f.company_name, f.year, f.document_id)
 
+        # Byte-identical PDFs (e.g. a year's tree copied from the last)
+        # are processed once, through the first filing that has them.
+        filings, duplicates = _split_duplicates(filings)
+
         # Ensure output dirs exist
         os.makedirs(PARSING_OUTPUT_DIR, exist_ok=True)
         os.makedirs(EXTRACTION_OUTPUT_DIR, exist_ok=True)
 
-        summaries: list[dict] = []
-
         # ── Stage 1 & 2: Parse and Extract each filing ────────────────
-        extraction_paths: list[str] = []
-
-        for filing in filings:
-            summary: dict = {
-                "document_id": filing.document_id,
-                "company": filing.company_name,
-                "year": filing.year,
-                "pdf_path": filing.pdf_path,
+        # Never more workers than LLM calls per window: each needs a
+        # share of at least one call, or together they would overrun it.
+        workers = min(self.max_workers, len(filings), max(1, self.llm_rate_limit))
+        if workers > 1:
+            logger.info("Parsing and extracting with %d worker processes.", workers)
+            # Split the CPUs between filings rather than letting each
+            # filing's page conversion claim all of them.
+            parser_workers = max(1, (os.cpu_count() or 1) // workers)
+            # Each worker's extractor throttles itself, so give each an
+            # equal share of the provider's rate limit.
+            rate_limit = max(1, self.llm_rate_limit // workers)
+            results: list[tuple[dict, str | None] | None] = [None] * len(filings)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(
+                        _parse_and_extract, filing, self.skip_existing, parser_workers, rate_limit,
+                    ): i
+                    for i, filing in enumerate(filings)
+                }
+                for future in as_completed(futures):
+                    filing = filings[futures[future]]
+                    try:
+                        result = future.result()
+                    except Exception as exc:
+                        # The worker died (e.g. a broken pool) before it
+                        # could report a stage; charge it to parsing.
+                        logger.error("Processing failed for %s: %s", filing.document_id, exc)
+                        result = _failed_summary(filing, "parsing", exc), None
+                    results[futures[future]] = result
+                    notify(result[0])
+        else:
+            # The next filing is parsed on a background thread while this
+            # one is extracted, and output writes drain in the background;
+            # all have landed before ingestion starts.
+            pending = []
+            with ThreadPoolExecutor(max_workers=MAX_PENDING_WRITES, thread_name_prefix="pipeline-io") as io, \
+                    ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-parse") as parser:
+                for filing, parsed in self._parse_ahead(filings, io, parser):
+                    pending.append(self._extract_stage(filing, io, *parsed))
+                    notify(pending[-1][0])
+            results = [_settle_writes(*item) for item in pending]
+
+        # Keep discovery order regardless of completion order
+        summaries: list[dict] = [summary for summary, _ in results]
+        extraction_paths: list[str] = [path for _, path in results if path]
+        summaries.extend(
+            {
+                "document_id": dup.document_id,
+                "company": dup.company_name,
+                "year": dup.year,
+                "pdf_path": dup.pdf_path,
+                "duplicate_of": original.document_id,
                 "stages": {},
             }
-
-            # ── Parse ─────────────────────────────────────────────────
-            try:
-                parsed_path = self._run_parsing(filing)
-                summary["stages"]["parsing"] = {"status": "ok", "output": parsed_path}
-            except Exception as exc:
-                logger.error("Parsing failed for %s: %s", filing.document_id, exc)
-                summary["stages"]["parsing"] = {"status": "error", "message": str(exc)}
-                summaries.append(summary)
-                continue
-
-            # ── Extract ───────────────────────────────────────────────
-            try:
-                extracted_path = self._run_extraction(filing)
-                summary["stages"]["extraction"] = {"status": "ok", "output": extracted_path}
-                extraction_paths.append(extracted_path)
-            except Exception as exc:
-                logger.error("Extraction failed for %s: %s", filing.document_id, exc)
-                summary["stages"]["extraction"] = {"status": "error", "message": str(exc)}
-                summaries.append(summary)
-                continue
-
-            summaries.append(summary)
+            for dup, original in duplicates
+        )
 
         # ── Stage 3: Ingest all extracted files into Neo4j ────────────
         if extraction_paths:
@@ -206,15 +282,123 @@ class Pipeline:
 
         return summaries
 
+    def ensure_schema_indexes(self) -> None:
+        """
+        Create the per-type ``entity_id`` uniqueness constraints and the
+        lookup indexes before any filing is ingested, so every MERGE of the
+        run is index-backed.  Failures (e.g. Neo4j not up yet) are logged;
+        the ingest stage retries and reports them per filing.
+        """
+        try:
+            with GraphIngestor(driver=self.neo4j_driver) as gi:   # ensures constraints
+                gi.create_indexes()
+        except Exception as exc:
+            logger.warning("Could not create Neo4j schema up front: %s", exc)
+
+    def _process_filing(
+        self, filing: FilingInfo, io: ThreadPoolExecutor,
+    ) -> tuple[dict, str | None, list[tuple[str, Future]]]:
+        """
+        Parse and extract one filing, writing stage outputs on ``io``.
+        Returns its summary, the extraction output path (None if a stage
+        failed) and the ``(stage, write)`` pairs still in flight; see
+        ``_settle_writes``.
+        """
+        return self._extract_stage(filing, io, *self._parse_stage(filing, io))
+
+    def _parse_ahead(
+        self, filings: list[FilingInfo], io: ThreadPoolExecutor, parser: ThreadPoolExecutor,
+    ) -> Iterator[tuple[FilingInfo, tuple[dict, dict | None, list[tuple[str, Future]]]]]:
+        """
+        Yield ``(filing, _parse_stage result)`` in order, parsing up to
+        ``PARSE_AHEAD`` filings on ``parser`` ahead of the one being
+        consumed, so the next PDF is converted while the caller waits on
+        the LLM for the current one.
+        """
+        # Window of filings handed to ``parser``: seeded with PARSE_AHEAD,
+        # topped back up as each is taken, so while the caller extracts
+        # filing k only k+1 .. k+PARSE_AHEAD are parsed or parsing.
+        remaining = iter(filings)
+        queued: deque[tuple[FilingInfo, Future]] = deque(
+            (filing, parser.submit(self._parse_stage, filing, io))
+            for filing in islice(remaining, PARSE_AHEAD)
+        )
+        while queued:
+            filing, parsed = queued.popleft()
+            following = next(remaining, None)
+            if following is not None:
+                queued.append((following, parser.submit(self._parse_stage, following, io)))
+            yield filing, parsed.result()
+
+    def _parse_stage(
+        self, filing: FilingInfo, io: ThreadPoolExecutor,
+    ) -> tuple[dict, dict | None, list[tuple[str, Future]]]:
+        """
+        Parse one filing.  Returns its new summary, the parsed document
+        (None when skipped or failed) and the pending ``(stage, write)``
+        pairs.
+        """
+        summary: dict = {
+            "document_id": filing.document_id,
+            "company": filing.company_name,
+            "year": filing.year,
+            "pdf_path": filing.pdf_path,
+            "stages": {},
+        }
+        writes: list[tuple[str, Future]] = []
+
+        # Extraction works from the in-memory document while the parsed
+        # JSON is still being written.
+        try:
+            parsed_path, document, pending_write = self._run_parsing(filing, io)
+            summary["stages"]["parsing"] = {"status": "ok", "output": parsed_path}
+            if pending_write is not None:
+                writes.append(("parsing", pending_write))
+        except Exception as exc:
+            logger.error("Parsing failed for %s: %s", filing.document_id, exc)
+            summary["stages"]["parsing"] = {"status": "error", "message": str(exc)}
+            document = None
+        return summary, document, writes
+
+    def _extract_stage(
+        self,
+        filing: FilingInfo,
+        io: ThreadPoolExecutor,
+        summary: dict,
+        document: dict | None,
+        writes: list[tuple[str, Future]],
+    ) -> tuple[dict, str | None, list[tuple[str, Future]]]:
+        """Extract a filing that ``_parse_stage`` has handled; see ``_process_filing``."""
+        if summary["stages"]["parsing"]["status"] != "ok":
+            return summary, None, writes
+
+        try:
+            extracted_path, pending_write = self._run_extraction(filing, io, parsed_document=document)
+            summary["stages"]["extraction"] = {"status": "ok", "output": extracted_path}
+            if pending_write is not None:
+                writes.append(("extraction", pending_write))
+        except Exception as exc:
+            logger.error("Extraction failed for %s: %s", filing.document_id, exc)
+            summary["stages"]["extraction"] = {"status": "error", "message": str(exc)}
+            return summary, None, writes
+
+        return summary, extracted_path, writes
+
     # ── Stage runners ─────────────────────────────────────────────────
 
-    def _run_parsing(self, filing: FilingInfo) -> str:
-        """Parse a PDF and save the result.  Returns output path."""
+    def _run_parsing(
+        self, filing: FilingInfo, io: ThreadPoolExecutor,
+    ) -> tuple[str, dict | None, Future | None]:
+        """
+        Parse a PDF and save the result on ``io``.  Returns the output
+        path, the parsed document (None when skipped) and the pending
+        write.
+        """
         output_path = filing.parsed_json_path
 
-        if self.skip_existing and os.path.isfile(output_path):
-            logger.info("Parsing: skipping %s (output exists)", filing.document_id)
-            return output_path
+        if self.skip_existing and _is_current(output_path, filing.pdf_path):
+            logger.info("Parsing: skipping %s (output is current)", filing.document_id)
+            return output_path, None, None
 
         logger.info("Parsing: %s → %s", filing.pdf_path, output_path)
         with PDFParser(
@@ -222,57 +406,218 @@ class Pipeline:
             document_id=filing.document_id,
             document_name=filing.document_name,
             document_type="filing",
+            max_workers=self.parser_workers,
         ) as parser:
             document = parser.process_document()
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(document, f, indent=2, ensure_ascii=False)
+        pending_write = io.submit(
+            _write_output, output_path, document, filing.pdf_path, "pages",
+        )
+        return output_path, document, pending_write
 
-        return output_path
-
-    def _run_extraction(self, filing: FilingInfo) -> str:
-        """Extract entities/relations and save the result.  Returns output path."""
+    def _run_extraction(
+        self, filing: FilingInfo, io: ThreadPoolExecutor, parsed_document: dict | None = None,
+    ) -> tuple[str, Future | None]:
+        """
+        Extract entities/relations and save the result on ``io``.  Returns
+        the output path and the pending write (None when skipped).  Reads
+        the parsed JSON from disk unless ``parsed_document`` is given.
+        """
         output_path = filing.extracted_json_path
 
-        if self.skip_existing and os.path.isfile(output_path):
-            logger.info("Extraction: skipping %s (output exists)", filing.document_id)
-            return output_path
+        if self.skip_existing and _is_current(output_path, filing.pdf_path):
+            logger.info("Extraction: skipping %s (output is current)", filing.document_id)
+            return output_path, None
 
         parsed_path = filing.parsed_json_path
-        if not os.path.isfile(parsed_path):
+        if parsed_document is None and not os.path.isfile(parsed_path):
             raise FileNotFoundError(f"Parsed JSON not found: {parsed_path}")
 
         logger.info("Extraction: %s → %s", parsed_path, output_path)
         with EntityRelationExtractor(
             parsed_json_path=parsed_path,
             filing_year=filing.year,
+            parsed_document=parsed_document,
+            rate_limit=self.llm_rate_limit,
         ) as extractor:
             result = extractor.process_document()
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
-
-        return output_path
+        pending_write = io.submit(_write_output, output_path, result.to_dict(), filing.pdf_path)
+        return output_path, pending_write
 
     def _run_ingestion(self, extraction_paths: list[str]) -> list[dict]:
         """Ingest all extraction JSONs into Neo4j.  Returns summaries."""
         logger.info("Ingestion: %d file(s) into Neo4j", len(extraction_paths))
-        results: list[dict] = []
+        with GraphIngestor(driver=self.neo4j_driver) as gi:
+            return gi.ingest_many(extraction_paths)
 
-        with GraphIngestor() as gi:
-            for path in extraction_paths:
-                summary = gi.ingest(path)
-                results.append(summary)
-            gi.create_indexes()
 
-        return results
+# ── Helpers ──────────────────────────────────────────────────────────
 
+def _parse_and_extract(
+    filing: FilingInfo, skip_existing: bool, parser_workers: int, llm_rate_limit: int,
+) -> tuple[dict, str | None]:
+    """Worker-process entry point: ``Pipeline._process_filing`` for one filing."""
+    pipeline = Pipeline(
+        skip_existing, max_workers=1, parser_workers=parser_workers, llm_rate_limit=llm_rate_limit,
+    )
+    with ThreadPoolExecutor(max_workers=MAX_PENDING_WRITES, thread_name_prefix="pipeline-io") as io:
+        pending = pipeline._process_filing(filing, io)
+    return _settle_writes(*pending)
+
+
+def _failed_summary(filing: FilingInfo, stage: str, exc: BaseException) -> dict:
+    """Summary for a filing whose ``stage`` raised ``exc``."""
+    return {
+        "document_id": filing.document_id,
+        "company": filing.company_name,
+        "year": filing.year,
+        "pdf_path": filing.pdf_path,
+        "stages": {stage: {"status": "error", "message": str(exc)}},
+    }
+
+
+def _settle_writes(
+    summary: dict, extracted_path: str | None, writes: list[tuple[str, Future]],
+) -> tuple[dict, str | None]:
+    """
+    Wait for a filing's background writes; a failed write marks its
+    stage as an error (and keeps a failed extraction out of ingestion).
+    """
+    for stage, write in writes:
+        try:
+            write.result()
+        except Exception as exc:
+            logger.error("Writing %s output failed for %s: %s", stage, summary["document_id"], exc)
+            summary["stages"][stage] = {"status": "error", "message": str(exc)}
+            if stage == "extraction":
+                extracted_path = None
+    return summary, extracted_path
+
+
+def _split_duplicates(
+    filings: list[FilingInfo],
+) -> tuple[list[FilingInfo], list[tuple[FilingInfo, FilingInfo]]]:
+    """
+    Separate filings whose PDF is byte-identical to an earlier one.
+    Returns the unique filings and ``(duplicate, original)`` pairs.
+    Only files sharing a size are hashed, so distinct PDFs cost a stat.
+    """
+    sizes = [os.path.getsize(filing.pdf_path) for filing in filings]
+    size_counts = Counter(sizes)
+
+    # One pass in discovery order, so duplicates are reported (and their
+    # statuses recorded) in the order the filings were found
+    unique: list[FilingInfo] = []
+    duplicates: list[tuple[FilingInfo, FilingInfo]] = []
+    first_by_hash: dict[tuple[int, str], FilingInfo] = {}
+    for filing, size in zip(filings, sizes):
+        if size_counts[size] < 2:
+            unique.append(filing)
+            continue
+        original = first_by_hash.setdefault((size, _file_hash(filing.pdf_path)), filing)
+        if original is filing:
+            unique.append(filing)
+        else:
+            logger.warning(
+                "Skipping %s: identical to %s", filing.pdf_path, original.pdf_path,
+            )
+            duplicates.append((filing, original))
+
+    return unique, duplicates
+
+
+def _sorted_dirs(path: str) -> list[os.DirEntry]:
+    """Subdirectories of ``path`` by name; one directory read, no extra stats."""
+    with os.scandir(path) as it:
+        return sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+
+
+def _write_output(
+    output_path: str, document: dict, source_path: str, stream_key: str | None = None,
+) -> None:
+    """
+    Write a stage's JSON output, then its manifest.  With ``stream_key``
+    that list is serialised one element at a time instead of building the
+    whole file in memory.
+    """
+    # Written aside and renamed into place before the manifest, so a run
+    # interrupted mid-write never leaves a truncated output that the
+    # manifest (old or new) would vouch for
+    tmp_path = f"{output_path}.tmp"
+    if stream_key is None:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(document, option=orjson.OPT_INDENT_2))
+    else:
+        header = {k: v for k, v in document.items() if k != stream_key}
+        dump_json_stream(tmp_path, header, stream_key, document[stream_key])
+    os.replace(tmp_path, output_path)
+    _write_manifest(output_path, source_path)
+
+
+def _manifest_path(output_path: str) -> str:
+    return f"{output_path}.manifest.json"
+
+
+def _file_hash(path: str) -> str:
+    """BLAKE2b digest of a file's contents, read in large chunks."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+
+def _source_stat(path: str) -> dict:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime": st.st_mtime}
+
+
+def _write_manifest(output_path: str, source_path: str, digest: str | None = None) -> None:
+    """Record which source PDF content ``output_path`` was produced from."""
+    manifest = {"hash": digest or _file_hash(source_path), **_source_stat(source_path)}
+    path = _manifest_path(output_path)
+    # Written aside and renamed into place, so an interrupted run never
+    # leaves a truncated manifest next to a complete output
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def _is_current(output_path: str, source_path: str) -> bool:
+    """
+    True if ``output_path`` exists and was produced from the current
+    contents of ``source_path``.
+
+    An unchanged size and mtime is trusted without hashing; otherwise the
+    PDF is hashed and compared, so a touched-but-identical file is still
+    reused and an edited one is not.  Outputs from before manifests
+    existed are adopted as current.
+    """
+    if not os.path.isfile(output_path):
+        return False
+
+    try:
+        with open(_manifest_path(output_path), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        _write_manifest(output_path, source_path)
+        return True
+    except (OSError, ValueError):
+        return False
+
+    stat = _source_stat(source_path)
+    if manifest.get("size") == stat["size"] and manifest.get("mtime") == stat["mtime"]:
+        return True
+
+    digest = _file_hash(source_path)
+    if manifest.get("hash") != digest:
+        return False
+    _write_manifest(output_path, source_path, digest)   # refresh the stat
+    return True
 
-# ── Helpers ──────────────────────────────────────────────────────────
 
 def _slugify(text: str) -> str:
     """Convert text to a clean slug: lowercase, underscores, no special chars."""
     text = text.lower().strip()
-    text = re.sub(r"[^a-z0-9]+", "_", text)
+    text = _SLUG_RE.sub("_", text)
     text = text.strip("_")
     return text
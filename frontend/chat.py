@@ -42,12 +42,15 @@ st.caption("Ask questions about ingested SEC filings.  Data is retrieved from a
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
-if "agent" not in st.session_state:
-    st.session_state.agent = QueryAgent()
-
 
+@st.cache_resource(show_spinner="Connecting to the knowledge graph…")
 def get_agent() -> QueryAgent:
-    return st.session_state.agent
+    """
+    One agent per server process, shared by every browser session.
+    Queries fork their own retriever context, so sessions do not see
+    each other's evidence.
+    """
+    return QueryAgent()
 
 
 # ── Sidebar ───────────────────────────────────────────────────────────
@@ -58,7 +61,7 @@ with st.sidebar:
         st.rerun()
 
     if st.button("📋  Show graph schema"):
-        schema = get_agent().retriever.get_schema_summary()
+        schema = get_agent().schema_summary()
         st.code(schema, language="text")
 
     st.divider()
@@ -71,30 +74,47 @@ with st.sidebar:
 
 
 # ── Render chat history ──────────────────────────────────────────────
-for msg in st.session_state.messages:
-    with st.chat_message(msg["role"]):
-        st.markdown(msg["content"])
-
-        # Show metadata expander for assistant messages
-        if msg["role"] == "assistant" and msg.get("meta"):
-            meta = msg["meta"]
-            with st.expander("Details", expanded=False):
-                col1, col2 = st.columns(2)
-                col1.metric("Confidence", meta.get("confidence", "—"))
-                col2.metric("Tool calls", len(meta.get("tool_calls", [])))
-
-                if meta.get("has_sufficient_data") is False:
-                    st.warning(f"Missing data: {meta.get('missing_data', 'unknown')}")
-
-                if meta.get("assessment"):
-                    st.markdown("**Assessment**")
-                    st.json(meta["assessment"])
-                if meta.get("plan"):
-                    st.markdown("**Retrieval plan**")
-                    st.json(meta["plan"])
-                if meta.get("tool_calls"):
-                    st.markdown("**Tool calls**")
-                    st.json(meta["tool_calls"])
+def _render_details(meta: dict) -> None:
+    """Confidence, missing data, plan and tool calls for one answer."""
+    col1, col2 = st.columns(2)
+    col1.metric("Confidence", meta.get("confidence", "—"))
+    col2.metric("Tool calls", len(meta.get("tool_calls", [])))
+
+    if meta.get("has_sufficient_data") is False:
+        st.warning(f"Missing data: {meta.get('missing_data', 'unknown')}")
+
+    if meta.get("assessment"):
+        st.markdown("**Assessment**")
+        st.json(meta["assessment"])
+    if meta.get("plan"):
+        st.markdown("**Retrieval plan**")
+        st.json(meta["plan"])
+    if meta.get("tool_calls"):
+        st.markdown("**Tool calls**")
+        st.json(meta["tool_calls"])
+
+
+def _render_message(i: int, msg: dict) -> None:
+    """Message ``i``'s text, plus its details once toggled open."""
+    st.markdown(msg["content"])
+
+    if msg["role"] == "assistant" and msg.get("meta"):
+        if st.toggle("Details", key=f"details_{i}"):
+            _render_details(msg["meta"])
+
+
+@st.fragment
+def _render_history() -> None:
+    """
+    Past messages.  Details are only built when toggled open, and as a
+    fragment, toggling reruns this history alone rather than the page.
+    """
+    for i, msg in enumerate(st.session_state.messages):
+        with st.chat_message(msg["role"]):
+            _render_message(i, msg)
+
+
+_render_history()
 
 
 # ── Handle user input ────────────────────────────────────────────────
@@ -109,37 +129,17 @@ if prompt := st.chat_input("Ask a question about the filings…"):
         with st.spinner("Thinking…"):
             result = get_agent().query(prompt)
 
-        st.markdown(result["answer"])
-
-        # Inline details
-        with st.expander("Details", expanded=False):
-            col1, col2 = st.columns(2)
-            col1.metric("Confidence", result.get("confidence", "—"))
-            col2.metric("Tool calls", len(result.get("tool_calls", [])))
-
-            if result.get("has_sufficient_data") is False:
-                st.warning(f"Missing data: {result.get('missing_data', 'unknown')}")
-
-            if result.get("assessment"):
-                st.markdown("**Assessment**")
-                st.json(result["assessment"])
-            if result.get("plan"):
-                st.markdown("**Retrieval plan**")
-                st.json(result["plan"])
-            if result.get("tool_calls"):
-                st.markdown("**Tool calls**")
-                st.json(result["tool_calls"])
-
-    # Record assistant message
-    st.session_state.messages.append({
-        "role": "assistant",
-        "content": result["answer"],
-        "meta": {
-            "confidence": result.get("confidence"),
-            "has_sufficient_data": result.get("has_sufficient_data"),
-            "missing_data": result.get("missing_data"),
-            "assessment": result.get("assessment"),
-            "plan": result.get("plan"),
-            "tool_calls": result.get("tool_calls", []),
-        },
-    })
+        # Record the answer, then render it exactly as the history will
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": result["answer"],
+            "meta": {
+                "confidence": result.get("confidence"),
+                "has_sufficient_data": result.get("has_sufficient_data"),
+                "missing_data": result.get("missing_data"),
+                "assessment": result.get("assessment"),
+                "plan": result.get("plan"),
+                "tool_calls": result.get("tool_calls", []),
+            },
+        })
+        _render_message(len(st.session_state.messages) - 1, st.session_state.messages[-1])
@@ -1,6 +1,6 @@
 import sys
 import os
-import json
+import orjson
 import logging
 
 
@@ -26,5 +26,5 @@ else:
 with EntityRelationExtractor(parsed_json_path=parsed_json_path, filing_year="2026") as extractor:
     result = extractor.process_document()
     output_path = f"./output/extraction/extracted_{base_name}.json"
-    with open(output_path, "w") as file:
-        json.dump(result.to_dict(), file, indent=2, ensure_ascii=False)
\ No newline at end of file
+    with open(output_path, "wb") as file:
+        file.write(orjson.dumps(result.to_dict(), option=orjson.OPT_INDENT_2))
\ No newline at end of file
@@ -9,7 +9,6 @@ Usage:
 
 import os
 import sys
-import subprocess
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
@@ -23,9 +22,15 @@ def main() -> None:
         frontend_app,
         "--server.port", port,
         "--server.headless", "true",
+        # Editing sources should not rerun the app and rebuild the agent
+        "--server.runOnSave", "false",
     ]
-    print(f"Starting Streamlit on port {port} …")
-    subprocess.run(cmd, cwd=project_root)
+    print(f"Starting Streamlit on port {port} …", flush=True)
+    # No source watching in this launcher; it walks the project tree
+    os.environ.setdefault("STREAMLIT_SERVER_FILE_WATCHER_TYPE", "none")
+    # Become the Streamlit process rather than waiting on a child
+    os.chdir(project_root)
+    os.execvp(cmd[0], cmd)
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ Requires a running Neo4j instance (see docker-compose.yml).
 """
 
 import sys
+import io
 import os
 import glob
 import json
@@ -37,7 +38,8 @@ def collect_extraction_files(path: str) -> list[str]:
         return [path]
     if os.path.isdir(path):
         pattern = os.path.join(path, "*.json")
-        files = sorted(glob.glob(pattern))
+        # skip the pipeline's per-output "<name>.json.manifest.json" files
+        files = sorted(f for f in glob.glob(pattern) if not f.endswith(".manifest.json"))
         if not files:
             print(f"No JSON files found in {path}")
             sys.exit(1)
@@ -60,27 +62,24 @@ def main() -> None:
     print()
 
     with GraphIngestor() as gi:
-        summaries = []
-        for filepath in files:
-            summary = gi.ingest(filepath)
-            summaries.append(summary)
-
-        # Create indexes after all documents are ingested
-        gi.create_indexes()
-
-    # Print summary
-    print(f"\n{'='*60}")
-    print("INGESTION SUMMARY")
-    print(f"{'='*60}")
+        # Resolves every file first, then writes the graph in one pass
+        summaries = gi.ingest_many(files)
+
+    # Print summary (buffered: one write for the whole block)
+    out = io.StringIO()
+    print(f"\n{'='*60}", file=out)
+    print("INGESTION SUMMARY", file=out)
+    print(f"{'='*60}", file=out)
     for s in summaries:
-        print(f"\nDocument: {s['document_id']}")
-        print(f"  Entities resolved:  {s['entities_resolved']}")
-        print(f"  Entities remapped:  {s['entities_remapped']} (fuzzy-matched)")
-        print(f"  Entities written:   {s['entities_written']}")
-        print(f"  Relationships written: {s['relationships_written']}")
-    print(f"\n{'='*60}")
-    print("Done. Verify in Neo4j Browser at http://localhost:7474")
-    print(f"{'='*60}\n")
+        print(f"\nDocument: {s['document_id']}", file=out)
+        print(f"  Entities resolved:  {s['entities_resolved']}", file=out)
+        print(f"  Entities remapped:  {s['entities_remapped']} (fuzzy-matched)", file=out)
+        print(f"  Entities written:   {s['entities_written']}", file=out)
+        print(f"  Relationships written: {s['relationships_written']}", file=out)
+    print(f"\n{'='*60}", file=out)
+    print("Done. Verify in Neo4j Browser at http://localhost:7474", file=out)
+    print(f"{'='*60}\n", file=out)
+    sys.stdout.write(out.getvalue())
 
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 import sys
+import io
 import os
 import logging
+from itertools import islice
+from pathlib import PurePath
 
 # Add project root to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,38 +14,56 @@ sys.path.insert(0, project_root)
 logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
 
 from app.graphrag.pdf_parsing import PDFParser
-import json
+from app.core.jsonio import dump_json_stream
 
 pdf_path = "./data/infosys_form20f-2025_sample.pdf"
-file_name = os.path.splitext(os.path.basename(pdf_path))[0]  # Extract file name without modifying pdf_path
+pdf_name = PurePath(pdf_path)
+output_path = f"./output/parsing/parsed_{pdf_name.stem}.json"
+
+# Page-conversion processes: `--workers N` (default: one per CPU)
+workers = None
+if "--workers" in sys.argv:
+    value = sys.argv[sys.argv.index("--workers") + 1:][:1]
+    if not value or not value[0].isdigit() or int(value[0]) < 1:
+        print("Usage: python scripts/run_parsing.py [--workers N]   (N >= 1)")
+        sys.exit(1)
+    workers = int(value[0])
 
 with PDFParser(
     pdf_path=pdf_path, 
     document_id="infosys_20f_2025_sample", 
-    document_name=pdf_path.split("/")[-1], 
-    document_type="sampled_filing"
+    document_name=pdf_name.name,
+    document_type="sampled_filing",
+    max_workers=workers,
 ) as ingestor:
-    # Process document - returns complete document structure
-    document = ingestor.process_document()
-    
+    # Pages are written out as they are converted, and summarised on
+    # the way, so the whole document is never held in memory
+    document = ingestor.document_header()
+
+    # Print summary (buffered: one write for the whole block)
+    out = io.StringIO()
+    print(f"\n{'='*60}", file=out)
+    print("PARSING SUMMARY", file=out)
+    print(f"{'='*60}", file=out)
+    print(f"Document: {document['name']}", file=out)
+    print(f"Document ID: {document['id']}", file=out)
+    print(f"Total pages: {document['metadata']['page_count']}", file=out)
+
+    def summarised(pages):
+        for page in pages:
+            page_num = page['page_number']
+            block_count = len(page['blocks'])
+            print(f"\nPage {page_num}: {block_count} blocks", file=out)
+            for block in islice(page['blocks'], 3):  # Show first 3 blocks
+                content_preview = block['content'][:50].replace('\n', ' ')
+                print(f"  - {block['block_type']}: {content_preview}...", file=out)
+            yield page
+
     # Save to JSON
-    with open(f'./output/parsing/parsed_{file_name}.json', 'w', encoding='utf-8') as f:
-        json.dump(document, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n✓ Output saved to ./output/parsing/parsed_output.json")
-    
-    # Print summary
-    print(f"\n{'='*60}")
-    print("PARSING SUMMARY")
-    print(f"{'='*60}")
-    print(f"Document: {document['name']}")
-    print(f"Document ID: {document['id']}")
-    print(f"Total pages: {document['metadata']['page_count']}")
+    dump_json_stream(
+        output_path,
+        document, "pages", summarised(ingestor.process_document_stream()),
+    )
     
-    for page in document['pages']:
-        page_num = page['page_number']
-        block_count = len(page['blocks'])
-        print(f"\nPage {page_num}: {block_count} blocks")
-        for block in page['blocks'][:3]:  # Show first 3 blocks
-            content_preview = block['content'][:50].replace('\n', ' ')
-            print(f"  - {block['block_type']}: {content_preview}...")
+    print(f"\n✓ Output saved to {output_path}")
+    sys.stdout.write(out.getvalue())
@@ -24,6 +24,7 @@ Requires a running Neo4j instance (see docker-compose.yml).
 """
 
 import sys
+import io
 import os
 import logging
 
@@ -38,9 +39,19 @@ logging.basicConfig(
 )
 logging.getLogger("neo4j").setLevel(logging.WARNING)
 
+from neo4j import GraphDatabase
+
+from app.core.config import settings
 from app.pipeline import Pipeline, FILINGS_DIR
 
 
+def _print_progress(summary: dict) -> None:
+    """One line per filing as its parse + extract stages complete."""
+    stages = summary.get("stages", {})
+    status = "ok" if all(st.get("status") == "ok" for st in stages.values()) else "FAILED"
+    print(f"  [{status}] {summary['document_id']}", flush=True)
+
+
 def main() -> None:
     # Parse arguments
     company_filter = None
@@ -60,8 +71,6 @@ def main() -> None:
         print(f"  {FILINGS_DIR}/infosys/2025/form20f-2025.pdf\n")
         sys.exit(1)
 
-    pipeline = Pipeline(skip_existing=not force)
-
     print(f"\n{'='*60}")
     print("  CONTEXT BUILDING PIPELINE")
     if company_filter:
@@ -72,21 +81,32 @@ def main() -> None:
         print(f"  Mode: INCREMENTAL (skipping existing outputs)")
     print(f"{'='*60}\n")
 
-    summaries = pipeline.run(company_filter)
+    # One pooled driver for the whole run, handed to the ingest stage
+    with GraphDatabase.driver(
+        settings.NEO4J_URI,
+        auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD),
+        max_connection_pool_size=settings.NEO4J_MAX_POOL_SIZE,
+    ) as driver:
+        pipeline = Pipeline(skip_existing=not force, neo4j_driver=driver)
+        pipeline.ensure_schema_indexes()
+        summaries = pipeline.run(company_filter, on_filing_done=_print_progress)
 
     if not summaries:
         print("No filings found to process.")
         sys.exit(1)
 
-    # Print results
-    print(f"\n{'='*60}")
-    print("PIPELINE RESULTS")
-    print(f"{'='*60}")
+    # Print results (buffered: one write for the whole block)
+    out = io.StringIO()
+    print(f"\n{'='*60}", file=out)
+    print("PIPELINE RESULTS", file=out)
+    print(f"{'='*60}", file=out)
     for s in summaries:
-        print(f"\n  Document: {s['document_id']}")
-        print(f"  Company:  {s['company']}")
-        print(f"  Year:     {s['year']}")
-        print(f"  PDF:      {s['pdf_path']}")
+        print(f"\n  Document: {s['document_id']}", file=out)
+        print(f"  Company:  {s['company']}", file=out)
+        print(f"  Year:     {s['year']}", file=out)
+        print(f"  PDF:      {s['pdf_path']}", file=out)
+        if s.get("duplicate_of"):
+            print(f"  Skipped:  identical to {s['duplicate_of']}", file=out)
         for stage_name, stage_info in s.get("stages", {}).items():
             status = stage_info.get("status", "?")
             icon = "OK" if status == "ok" else "FAIL"
@@ -100,14 +120,15 @@ def main() -> None:
                 )
             elif status == "error":
                 detail = f" — {stage_info.get('message', '')}"
-            print(f"    {stage_name:12s} [{icon}]{detail}")
+            print(f"    {stage_name:12s} [{icon}]{detail}", file=out)
 
-    print(f"\n{'='*60}")
+    print(f"\n{'='*60}", file=out)
     ok_count = sum(1 for s in summaries
                    if all(st.get("status") == "ok"
                           for st in s.get("stages", {}).values()))
-    print(f"  {ok_count}/{len(summaries)} filings fully processed.")
-    print(f"{'='*60}\n")
+    print(f"  {ok_count}/{len(summaries)} filings fully processed.", file=out)
+    print(f"{'='*60}\n", file=out)
+    sys.stdout.write(out.getvalue())
 
 
 if __name__ == "__main__":
@@ -54,11 +54,18 @@ def main() -> None:
             print_result(result)
             return
 
-        # Interactive mode
+        # Interactive mode: load the schema up front so the first answer
+        # isn't slow (no LLM request, so this costs nothing)
+        try:
+            agent.warmup()
+        except Exception as exc:
+            print(f"Warm-up failed ({exc}); questions may still fail.")
+
         print("=" * 60)
         print("  Financial Filing Query Agent")
         print("  Type your question, or 'quit' to exit.")
-        print("  Type 'schema' to see what's in the graph.")
+        print("  Type 'schema' to see what's in the graph")
+        print("  ('schema --refresh' to re-read it from Neo4j).")
         print("=" * 60)
 
         while True:
@@ -73,8 +80,10 @@ def main() -> None:
             if question.lower() in ("quit", "exit", "q"):
                 print("Goodbye!")
                 break
-            if question.lower() == "schema":
-                print(agent.retriever.get_schema_summary())
+            if question.lower() in ("schema", "schema --refresh"):
+                # Shares the agent's cached summary (SCHEMA_CACHE_TTL)
+                refresh = question.lower().endswith("--refresh")
+                print(agent.schema_summary(refresh=refresh))
                 continue
 
             result = agent.query(question)